@@ -6,6 +6,7 @@ It uses threading for parallelization and provides progress callbacks for
 monitoring download progress.
 """
 import logging
+import os
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
@@ -223,22 +224,31 @@ class Downloader:
                            output_dir: Path,
                            index: int) -> Path:
         """Task wrapper for downloading a single image."""
+        # Generate filename
+        filename = f"{index + 1:03d}.jpg"  # 001.jpg, 002.jpg, etc.
+        image_path = output_dir / filename
+        # Written under a temporary name and renamed on success, so a failed
+        # download never leaves a truncated image for the converter to pack
+        part_path = output_dir / f"{filename}.part"
         try:
-            # Download image data
-            image_data = provider.download_image(url)
-
-            # Generate filename
-            filename = f"{index + 1:03d}.jpg"  # 001.jpg, 002.jpg, etc.
-            image_path = output_dir / filename
-
-            # Save image
-            with open(image_path, 'wb') as f:
-                f.write(image_data)
-
+            # Providers that can stream straight to disk skip the in-memory copy
+            download_to = getattr(provider, 'download_image_to', None)
+            if download_to is not None:
+                download_to(url, str(part_path))
+            else:
+                # Download image data
+                image_data = provider.download_image(url)
+
+                # Save image
+                with open(part_path, 'wb') as f:
+                    f.write(image_data)
+
+            os.replace(part_path, image_path)
             logger.debug(f"Saved image: {image_path}")
             return image_path
 
         except Exception as e:
+            part_path.unlink(missing_ok=True)
             logger.error(f"Image download task failed for {url}: {e}")
             raise
 
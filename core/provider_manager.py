@@ -157,10 +157,28 @@ class ProviderManager:
         This will re-scan the providers directory and reload all providers.
         """
         logger.info("Reloading providers...")
+        self.close_all()
         self.providers.clear()
         self._auto_discover_providers()
         logger.info(f"Reloaded {len(self.providers)} providers")
 
+    def close_all(self):
+        """
+        Release resources held by the loaded providers.
+
+        Calls close() on every provider that defines one (HTTP sessions,
+        browser instances, persisted cookies). A failing provider is logged
+        and does not stop the others from closing.
+        """
+        for provider_id, provider in self.providers.items():
+            close = getattr(provider, 'close', None)
+            if close is None:
+                continue
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close provider '{provider_id}': {e}")
+
     def validate_provider(self, provider_id: str) -> bool:
         """
         Validate that a provider is working correctly.
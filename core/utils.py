@@ -4,12 +4,21 @@ Utility functions for MangaForge.
 This module contains shared helper functions used throughout the application,
 including HTTP utilities, file operations, and common helper functions.
 """
+import importlib.util
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 import httpx
+from lxml import etree, html as lxml_html
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from models import Chapter, MangaInfo
 
@@ -61,6 +70,108 @@ def download_image_default(url: str, headers: Optional[Dict[str, str]] = None) -
         raise ProviderError(f"Failed to download image: {e}")
 
 
+def create_http_client(headers: Optional[Dict[str, str]] = None,
+                       timeout: float = 30.0,
+                       http2: bool = True,
+                       max_connections: int = 50,
+                       max_keepalive_connections: int = 20,
+                       retries: int = 0) -> httpx.Client:
+    """
+    Create a pooled HTTP client for a provider.
+
+    The client keeps connections alive between calls and is safe to share
+    across the downloader's worker threads. HTTP/2 is only enabled when
+    the optional ``h2`` package is installed, so concurrent requests to the
+    same host can be multiplexed over a single connection.
+
+    Args:
+        headers: Default headers sent with every request
+        timeout: Request timeout in seconds
+        http2: Enable HTTP/2 when available
+        max_connections: Maximum number of open connections
+        max_keepalive_connections: Maximum number of idle pooled connections
+        retries: Connection-level retries performed by the transport
+
+    Returns:
+        Configured httpx.Client
+    """
+    use_http2 = http2 and importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+
+    return httpx.Client(
+        headers=headers,
+        timeout=timeout,
+        follow_redirects=True,
+        transport=httpx.HTTPTransport(http2=use_http2, limits=limits, retries=retries),
+    )
+
+
+def parse_json(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    Uses orjson (C implementation, decodes bytes directly) when it is
+    installed and falls back to the standard library otherwise.
+
+    Args:
+        data: Raw JSON, typically ``response.content``
+
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    import json
+    return json.loads(data)
+
+
+def parse_tree(text: str) -> Optional[lxml_html.HtmlElement]:
+    """
+    Parse an HTML page with lxml.
+
+    Args:
+        text: Page markup
+
+    Returns:
+        Root element, or None if the page holds no elements at all
+        (empty, or nothing but whitespace/comments)
+    """
+    try:
+        return lxml_html.fromstring(text)
+    except etree.ParserError:
+        return None
+
+
+def has_class(name: str) -> str:
+    """
+    XPath predicate equivalent to the CSS class selector ``.name``.
+
+    Args:
+        name: Class name to match
+
+    Returns:
+        Predicate for use inside ``[...]`` of an XPath step
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def node_text(node, sep: str = "") -> str:
+    """
+    lxml counterpart of BeautifulSoup's ``get_text(sep, strip=True)``.
+
+    Args:
+        node: lxml element
+        sep: String placed between the stripped text chunks
+
+    Returns:
+        Non-empty text chunks of the element, stripped and joined by sep
+    """
+    return sep.join(t for t in (chunk.strip() for chunk in node.itertext()) if t)
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename for safe filesystem use.
@@ -352,6 +463,64 @@ def retry_request(func, max_attempts: int = 3, delay: float = 1.0):
         raise RuntimeError("Function failed after all retry attempts")
 
 
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Used by providers to avoid refetching pages or API responses that
+    were requested moments ago (e.g. manga info followed by chapters).
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept (least recently used evicted)
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (default TTL if omitted)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any):
+        """Remove a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
 class ProviderError(Exception):
     """Exception raised by provider-related errors."""
     pass
\ No newline at end of file
@@ -94,7 +94,11 @@ def main():
         from cli.app import MangaForgeApp
 
         app = MangaForgeApp()
-        app.run()
+        try:
+            app.run()
+        finally:
+            # Close provider sessions, browsers and cookie jars on every exit path
+            app.provider_manager.close_all()
 
         return 0
 
@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class MangaSearchResult:
     """
     Result from search - minimal info for displaying search results.
@@ -27,7 +27,7 @@ class MangaSearchResult:
         return f"[{self.provider_id}] {self.title}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MangaInfo:
     """
     Detailed manga information retrieved from a provider.
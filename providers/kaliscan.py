@@ -1,8 +1,10 @@
 """KaliScan provider implementation for MangaForge."""
 
 import asyncio
+import atexit
 import logging
 import re
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
@@ -33,6 +35,20 @@ class KaliscanProvider(BaseProvider):
         re.compile(r"([0-9]+(?:\.[0-9]+)?)"),
     )
 
+    # One Chromium shared by every instance and call. Playwright's async
+    # objects belong to the loop that created them, so the browser lives on
+    # a private event loop thread and sync callers submit work to it.
+    _browser_loop: Optional[asyncio.AbstractEventLoop] = None
+    _browser_launch_lock: Optional[asyncio.Lock] = None
+    _playwright = None
+    _browser: Optional[Browser] = None
+    _loop_lock = threading.Lock()
+
+    # Image URLs are read from the DOM, so no subresource besides documents,
+    # scripts and XHRs needs to load
+    _BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+    _BLOCKED_HOSTS_RE = re.compile(r"googletagmanager|google-analytics|doubleclick|adservice|analytics")
+
     def __init__(self) -> None:
         self.config = Config()
         self.timeout = float(self.config.get("network.timeout", 30) or 30)
@@ -140,16 +156,107 @@ class KaliscanProvider(BaseProvider):
         chapter_url = self._normalise_chapter_url(chapter_id)
         logger.debug("Fetching Kaliscan chapter images using Playwright for %s", chapter_url)
 
-        # Use the same approach as MangaKakalot for handling asyncio event loops
+        return self._run_on_browser_loop(self._extract_images_playwright(chapter_url))
+
+    def get_chapter_images_bulk(
+        self, chapter_ids: List[str], concurrency: int = 4
+    ) -> List[List[str]]:
+        """Image URLs for many chapters, rendering several at once.
+
+        Up to *concurrency* chapter pages are open in the shared browser at
+        a time, so a batch costs about the slowest pages rather than the
+        sum of them. Results keep the order of *chapter_ids*; a chapter
+        that fails is logged and returns an empty list.
+        """
+        if not chapter_ids:
+            return []
+        return self._run_on_browser_loop(
+            self._extract_images_many(chapter_ids, concurrency)
+        )
+
+    async def _extract_images_many(
+        self, chapter_ids: List[str], concurrency: int
+    ) -> List[List[str]]:
+        semaphore = asyncio.BoundedSemaphore(concurrency)
+
+        async def extract(chapter_id: str) -> List[str]:
+            chapter_url = self._normalise_chapter_url(chapter_id)
+            async with semaphore:
+                return await self._extract_images_playwright(chapter_url)
+
+        pages = await asyncio.gather(
+            *(extract(cid) for cid in chapter_ids), return_exceptions=True
+        )
+        results: List[List[str]] = []
+        for chapter_id, images in zip(chapter_ids, pages):
+            if isinstance(images, Exception):
+                logger.error(
+                    "Failed to extract images for chapter %s: %s", chapter_id, images
+                )
+                images = []
+            results.append(images)
+        return results
+
+    @classmethod
+    def _get_browser_loop(cls) -> asyncio.AbstractEventLoop:
+        """Start the shared browser's event loop thread on first use."""
+        with cls._loop_lock:
+            if cls._browser_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="kaliscan-playwright", daemon=True
+                ).start()
+                cls._browser_loop = loop
+                cls._browser_launch_lock = asyncio.Lock()
+                atexit.register(cls._shutdown_browser)
+            return cls._browser_loop
+
+    def _run_on_browser_loop(self, coro):
+        """Run *coro* on the browser loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_browser_loop()).result()
+
+    @classmethod
+    async def _get_browser(cls) -> Browser:
+        """The shared Chromium, launched once (again only if it crashed)."""
+        assert cls._browser_launch_lock is not None
+        async with cls._browser_launch_lock:
+            if cls._browser is None or not cls._browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                cls._browser = await cls._playwright.chromium.launch(headless=True)
+                logger.debug("Launched shared Chromium for KaliScan")
+            return cls._browser
+
+    @classmethod
+    async def _route_filter(cls, route) -> None:
+        request = route.request
+        if (request.resource_type in cls._BLOCKED_RESOURCE_TYPES
+                or cls._BLOCKED_HOSTS_RE.search(urlparse(request.url).netloc)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @classmethod
+    def _shutdown_browser(cls) -> None:
+        """Close the shared browser and stop its loop (registered with atexit)."""
+        loop = cls._browser_loop
+        if loop is None:
+            return
+
+        async def close() -> None:
+            if cls._browser is not None:
+                await cls._browser.close()
+            if cls._playwright is not None:
+                await cls._playwright.stop()
+            cls._browser = None
+            cls._playwright = None
+
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                logger.warning("Asyncio event loop already running, cannot use Playwright")
-                return []
-            else:
-                return loop.run_until_complete(self._extract_images_playwright(chapter_url))
-        except RuntimeError:
-            return asyncio.run(self._extract_images_playwright(chapter_url))
+            asyncio.run_coroutine_threadsafe(close(), loop).result(timeout=10)
+        except Exception as exc:
+            logger.debug("Error closing KaliScan browser: %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        cls._browser_loop = None
 
     def _fetch_chapter_images_from_server(
         self, chapter_numeric_id: str, server_id: str, chapter_url: str
@@ -182,70 +289,79 @@ class KaliscanProvider(BaseProvider):
         """Extract image URLs using Playwright to handle dynamic loading."""
         logger.debug("Using Playwright to extract images from %s", chapter_url)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent=self.config.get("network.user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"),
-                viewport={"width": 1280, "height": 800}
-            )
+        browser = await self._get_browser()
+        # A fresh context per chapter keeps cookies/storage isolated while
+        # the browser process itself is reused
+        context = await browser.new_context(
+            user_agent=self.config.get("network.user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"),
+            viewport={"width": 1280, "height": 800}
+        )
+        await context.route("**/*", self._route_filter)
 
-            page = await context.new_page()
+        page = await context.new_page()
 
-            try:
-                # Navigate to chapter URL
-                await page.goto(chapter_url, wait_until="domcontentloaded", timeout=60000)
+        try:
+            # Navigate to chapter URL
+            await page.goto(chapter_url, wait_until="domcontentloaded", timeout=60000)
 
-                # Handle the warning accept button if it appears (KaliScan specific)
-                try:
-                    await page.wait_for_selector("button.btn.btn-warning", timeout=10000)
-                    await page.click("button.btn.btn-warning")
-                    await page.wait_for_load_state("networkidle")
+            # Handle the warning accept button if it appears (KaliScan specific).
+            # Wait for the button or the reader images, whichever shows up
+            # first, so pages without the warning don't sit out the timeout;
+            # the image wait below replaces waiting for network idle.
+            try:
+                await page.wait_for_selector(
+                    "button.btn.btn-warning, div.chapter-image img[src]", timeout=10000
+                )
+                button = await page.query_selector("button.btn.btn-warning")
+                if button:
+                    await button.click()
                     logger.info("Clicked Accept button on KaliScan chapter page")
-                except Exception:
+                else:
                     logger.debug("No warning button found on KaliScan chapter page, continuing...")
+            except Exception:
+                logger.debug("No warning button found on KaliScan chapter page, continuing...")
 
-                # Wait for chapter images to be present and ensure they have started loading
-                try:
-                    await page.wait_for_function("""
-                        () => {
-                            const images = document.querySelectorAll('div.chapter-image img');
-                            return Array.from(images).some(img => img.src && img.src.length > 0);
-                        }
-                    """, timeout=20000)
-                    logger.debug("At least one chapter image has a non-empty src attribute.")
-                except Exception:
-                    logger.warning("Timed out waiting for images to have a src attribute. Scraping may fail.")
-
-                # Extract image URLs from div.chapter-image elements
-                image_divs = await page.query_selector_all("div.chapter-image")
-                if not image_divs:
-                    raise ProviderError(f"Unable to locate page images for chapter {chapter_url}")
-
-                image_urls: List[str] = []
-                for i, div in enumerate(image_divs, start=1):
-                    # Try data-src first (lazy loading)
-                    img_url = await div.get_attribute("data-src")
-                    if not img_url:
-                        # Fallback to src attribute
-                        img_tag = await div.query_selector("img")
-                        if img_tag:
-                            img_url = await img_tag.get_attribute("src")
-
-                    if img_url:
-                        # Ensure absolute URL
-                        if not img_url.startswith("http"):
-                            img_url = urljoin(self.base_url, img_url)
-                        image_urls.append(img_url)
-                    else:
-                        logger.warning("Could not extract image URL for page %d in chapter %s", i, chapter_url)
-
-                logger.info("Extracted %d image URLs from KaliScan chapter", len(image_urls))
-                return image_urls
-
-            finally:
-                await page.close()
-                await context.close()
-                await browser.close()
+            # Wait for chapter images to be present and ensure they have started loading
+            try:
+                await page.wait_for_function("""
+                    () => {
+                        const images = document.querySelectorAll('div.chapter-image img');
+                        return Array.from(images).some(img => img.src && img.src.length > 0);
+                    }
+                """, timeout=20000)
+                logger.debug("At least one chapter image has a non-empty src attribute.")
+            except Exception:
+                logger.warning("Timed out waiting for images to have a src attribute. Scraping may fail.")
+
+            # Extract image URLs from div.chapter-image elements
+            image_divs = await page.query_selector_all("div.chapter-image")
+            if not image_divs:
+                raise ProviderError(f"Unable to locate page images for chapter {chapter_url}")
+
+            image_urls: List[str] = []
+            for i, div in enumerate(image_divs, start=1):
+                # Try data-src first (lazy loading)
+                img_url = await div.get_attribute("data-src")
+                if not img_url:
+                    # Fallback to src attribute
+                    img_tag = await div.query_selector("img")
+                    if img_tag:
+                        img_url = await img_tag.get_attribute("src")
+
+                if img_url:
+                    # Ensure absolute URL
+                    if not img_url.startswith("http"):
+                        img_url = urljoin(self.base_url, img_url)
+                    image_urls.append(img_url)
+                else:
+                    logger.warning("Could not extract image URL for page %d in chapter %s", i, chapter_url)
+
+            logger.info("Extracted %d image URLs from KaliScan chapter", len(image_urls))
+            return image_urls
+
+        finally:
+            await page.close()
+            await context.close()
 
     def _fetch_chapter_list_via_api(
         self, manga_id: str, referer: str
@@ -4,9 +4,17 @@ MangaBuddy provider for MangaForge.
 This provider implements scraping for MangaBuddy.com.
 It extracts manga information, chapter lists, and image URLs for download.
 """
+import atexit
 import logging
+import random
 import re
 import json
+import shutil
+import threading
+import time
+import weakref
+from datetime import timedelta
+from pathlib import Path
 from typing import List, Optional, Tuple
 from urllib.parse import quote, urljoin
 
@@ -14,8 +22,94 @@ from core.base_provider import BaseProvider, ProviderError, MangaNotFoundError,
 from core.config import Config
 from models import MangaSearchResult, MangaInfo, Chapter
 
+try:
+    import requests_cache
+    from requests_cache import DO_NOT_CACHE
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    requests_cache = None  # type: ignore
+    DO_NOT_CACHE = None  # type: ignore
+    REQUESTS_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# On-disk HTTP cache for manga pages and chapter lists
+CACHE_PATH = Path('.cache') / 'mangabuddy'
+CACHE_TTL = timedelta(hours=6)
+
+# Cloudflare clearance cookies reused across runs
+COOKIE_PATH = Path('.cache') / 'mb_cookies.json'
+
+# First matching pattern wins. Only metadata pages are cached; search,
+# chapter reader pages and image CDNs always go to the network.
+CACHE_URL_RULES = {
+    'mangabuddy.com/api/manga/': CACHE_TTL,
+    'mangabuddy.com/search': DO_NOT_CACHE,
+    'mangabuddy.com/*/*': DO_NOT_CACHE,
+    'mangabuddy.com/': CACHE_TTL,
+}
+
+# TLS/header profile matching the Chrome User-Agent sent by get_headers()
+SCRAPER_BROWSER = {
+    'browser': 'chrome',
+    'platform': 'windows',
+    'mobile': False
+}
+
+
+def create_scraper(browser: Optional[dict] = None):
+    """
+    Build the cloudscraper session used by MangaBuddy.
+
+    With requests-cache installed, GETs for metadata pages are served from
+    a SQLite cache so warm runs skip the network and Cloudflare.
+
+    Args:
+        browser: cloudscraper browser profile (defaults to SCRAPER_BROWSER)
+
+    Returns:
+        A CloudScraper (cache-enabled when available)
+    """
+    import cloudscraper
+
+    browser = browser or SCRAPER_BROWSER
+    if not REQUESTS_CACHE_AVAILABLE:
+        return cloudscraper.create_scraper(browser=browser)
+
+    class BrowserScraper(cloudscraper.CloudScraper):
+        # CacheMixin only forwards kwargs named in the parent's signature and
+        # CloudScraper takes **kwargs, so `browser` must be spelled out here
+        # or it is dropped and a random TLS profile is picked
+        def __init__(self, browser=None, **kwargs):
+            super().__init__(browser=browser, **kwargs)
+
+    class CachedScraper(requests_cache.CacheMixin, BrowserScraper):
+        pass
+
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return CachedScraper(
+        cache_name=str(CACHE_PATH),
+        backend='sqlite',
+        expire_after=DO_NOT_CACHE,
+        urls_expire_after=CACHE_URL_RULES,
+        allowable_methods=('GET',),
+        cache_control=True,
+        browser=browser,
+    )
+
+
+# Live providers whose cookies are written once, at interpreter exit.
+# Weak references, so the exit hook never keeps a provider alive.
+_LIVE_PROVIDERS = weakref.WeakSet()
+
+
+def _save_live_cookies() -> None:
+    for provider in list(_LIVE_PROVIDERS):
+        provider._save_cookies()
+
+
+atexit.register(_save_live_cookies)
+
 
 class MangaBuddyProvider(BaseProvider):
     """
@@ -29,24 +123,142 @@ class MangaBuddyProvider(BaseProvider):
     provider_name = "MangaBuddy"
     base_url = "https://mangabuddy.com"
 
+    # Client-side throttling: token bucket refilled at this many requests/sec
+    requests_per_second = 4.0
+    # Retries for rate-limited (429) or unavailable (503) responses
+    max_retries = 5
+    max_backoff = 60.0
+
     def __init__(self):
         """Initialize the MangaBuddy provider with cloudscraper."""
         # Don't call super().__init__() since we're using cloudscraper
-        import cloudscraper
-
-        self.session = cloudscraper.create_scraper(
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            }
-        )
+        self.session = create_scraper()
 
         # Set headers
         self.session.headers.update(self.get_headers())
 
+        # Reuse cf_clearance from a previous run so warm starts skip the challenge
+        self._load_cookies()
+        self._saved_clearance = self.session.cookies.get('cf_clearance')
+        _LIVE_PROVIDERS.add(self)
+
+        # Token bucket state shared by all threads using this provider
+        self._bucket_lock = threading.Lock()
+        self._bucket_tokens = self.requests_per_second
+        self._bucket_updated = time.monotonic()
+
         logger.info("MangaBuddy provider initialized with CloudScraper")
 
+    def close(self) -> None:
+        """Persist cookies and release the scraper's connection pool."""
+        _LIVE_PROVIDERS.discard(self)
+        self._save_cookies()
+        self.session.close()
+
+    def _load_cookies(self) -> None:
+        """Load persisted session cookies, ignoring missing or corrupt files."""
+        try:
+            with open(COOKIE_PATH, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable MangaBuddy cookie file: {e}")
+            return
+
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                expires=cookie.get('expires'),
+                secure=cookie.get('secure', False),
+            )
+        logger.debug(f"Loaded {len(cookies)} MangaBuddy cookies from {COOKIE_PATH}")
+
+    def _save_cookies(self) -> None:
+        """Persist session cookies (including cf_clearance) to disk."""
+        cookies = [
+            {
+                'name': c.name,
+                'value': c.value,
+                'domain': c.domain,
+                'path': c.path,
+                'expires': c.expires,
+                'secure': c.secure,
+            }
+            for c in self.session.cookies
+            if not c.is_expired()
+        ]
+        try:
+            COOKIE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(COOKIE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cookies, f)
+        except OSError as e:
+            logger.debug(f"Could not save MangaBuddy cookies: {e}")
+
+    def _acquire_token(self) -> None:
+        """Block until the token bucket allows another request."""
+        while True:
+            with self._bucket_lock:
+                now = time.monotonic()
+                elapsed = now - self._bucket_updated
+                self._bucket_updated = now
+                self._bucket_tokens = min(
+                    self.requests_per_second,
+                    self._bucket_tokens + elapsed * self.requests_per_second,
+                )
+                if self._bucket_tokens >= 1.0:
+                    self._bucket_tokens -= 1.0
+                    return
+                wait = (1.0 - self._bucket_tokens) / self.requests_per_second
+            time.sleep(wait)
+
+    def _get(self, url: str, **kwargs):
+        """
+        Rate-limited GET that retries on HTTP 429/503.
+
+        Honors the server's Retry-After header when present, otherwise
+        backs off exponentially with jitter.
+
+        Args:
+            url: URL to fetch
+            **kwargs: Extra arguments passed to session.get
+
+        Returns:
+            The final response (callers still call raise_for_status)
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire_token()
+            response = self.session.get(url, **kwargs)
+
+            # Save as soon as a fresh clearance cookie shows up
+            clearance = self.session.cookies.get('cf_clearance')
+            if response.ok and clearance and clearance != self._saved_clearance:
+                self._saved_clearance = clearance
+                self._save_cookies()
+
+            if response.status_code not in (429, 503) or attempt == self.max_retries:
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+            try:
+                delay = float(retry_after) if retry_after else float(2 ** attempt)
+            except ValueError:
+                delay = float(2 ** attempt)
+            delay = min(self.max_backoff, delay) + random.uniform(0, 1)
+
+            logger.warning(
+                f"MangaBuddy returned HTTP {response.status_code} for {url}, "
+                f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+            )
+            # Release the pooled connection (held open by stream=True) while we wait
+            response.close()
+            time.sleep(delay)
+
+        return response
+
     def download_image(self, url: str) -> bytes:
         """
         Download a single image from MangaBuddy (bypasses Cloudflare).
@@ -60,7 +272,7 @@ class MangaBuddyProvider(BaseProvider):
         try:
             logger.debug(f"Downloading image with CloudScraper: {url}")
 
-            response = self.session.get(url, timeout=30)
+            response = self._get(url, timeout=30)
             response.raise_for_status()
 
             return response.content
@@ -69,6 +281,30 @@ class MangaBuddyProvider(BaseProvider):
             logger.error(f"Failed to download image {url}: {e}")
             raise ProviderError(f"Image download failed: {e}")
 
+    def download_image_to(self, url: str, path: str) -> None:
+        """
+        Stream a single image from MangaBuddy straight to disk.
+
+        Unlike download_image, the body is never buffered in memory as a
+        whole; it is copied to the file in 64 KB chunks.
+
+        Args:
+            url: Image URL to download
+            path: Destination file path
+        """
+        try:
+            logger.debug(f"Streaming image with CloudScraper: {url} -> {path}")
+
+            with self._get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=64 * 1024)
+
+        except Exception as e:
+            logger.error(f"Failed to download image {url}: {e}")
+            raise ProviderError(f"Image download failed: {e}")
+
     def search(self, query: str, page: int = 1) -> Tuple[List[MangaSearchResult], bool]:
         """
         Search for manga on MangaBuddy.com.
@@ -92,7 +328,7 @@ class MangaBuddyProvider(BaseProvider):
                 params = {'q': query, 'page': page}
 
             # Make request
-            response = self.session.get(search_url, params=params)
+            response = self._get(search_url, params=params)
             response.raise_for_status()
 
             # Parse HTML
@@ -169,7 +405,7 @@ class MangaBuddyProvider(BaseProvider):
             logger.debug(f"Fetching MangaBuddy manga info from: {target_url}")
 
             # Make request
-            response = self.session.get(target_url)
+            response = self._get(target_url)
             if response.status_code == 404:
                 raise MangaNotFoundError(f"Manga not found: {manga_id}")
             response.raise_for_status()
@@ -221,7 +457,7 @@ class MangaBuddyProvider(BaseProvider):
         Looks for: var bookId = 71459;
         """
         manga_url = f"{self.base_url}/{manga_id}"
-        response = self.session.get(manga_url)
+        response = self._get(manga_url)
         response.raise_for_status()
 
         match = re.search(r'var\s+bookId\s*=\s*(\d+)', response.text)
@@ -248,7 +484,7 @@ class MangaBuddyProvider(BaseProvider):
 
             # Step 2: call chapters API
             api_url = f"{self.base_url}/api/manga/{book_id}/chapters?source=detail"
-            response = self.session.get(api_url)
+            response = self._get(api_url)
             response.raise_for_status()
 
             # Step 3: parse the HTML fragment returned by the API
@@ -326,7 +562,7 @@ class MangaBuddyProvider(BaseProvider):
 
             logger.debug(f"Chapter URL: {chapter_url}")
 
-            response = self.session.get(chapter_url)
+            response = self._get(chapter_url)
             response.raise_for_status()
 
             # Extract var chapImages = '...'
@@ -426,33 +662,27 @@ class MangaBuddyProvider(BaseProvider):
 
     def _extract_authors(self, soup) -> List[str]:
         """Extract author information using MangaBuddy-specific selectors."""
-        authors = []
+        raw_authors = []
 
         # Use the specific MangaBuddy author selector
         author_p = soup.find('p', string=lambda text: text and 'Authors :' in text)
         if author_p:
-            author_links = author_p.find_all('a')
-            for link in author_links:
-                author = link.text.strip()
-                if author and author not in authors:
-                    authors.append(author)
+            raw_authors = [link.text for link in author_p.find_all('a')]
 
         # Fallback to generic selectors if specific one doesn't work
-        if not authors:
+        if not any(a.strip() for a in raw_authors):
             author_selectors = ['.manga-author', '.author', '[itemprop="author"]']
-            for selector in author_selectors:
-                author_elements = soup.select(selector)
-                for element in author_elements:
-                    author = element.text.strip()
-                    if author and author not in authors:
-                        authors.append(author)
+            raw_authors = [
+                element.text
+                for selector in author_selectors
+                for element in soup.select(selector)
+            ]
 
-        return authors
+        # Ordered de-duplication
+        return list(dict.fromkeys(a.strip() for a in raw_authors if a.strip()))
 
     def _extract_artists(self, soup) -> List[str]:
         """Extract artist information."""
-        artists = []
-
         # Look for artist information
         artist_selectors = [
             '.manga-artist',
@@ -461,39 +691,35 @@ class MangaBuddyProvider(BaseProvider):
             'div[class*="artist"]'
         ]
 
-        for selector in artist_selectors:
-            artist_elements = soup.select(selector)
-            for element in artist_elements:
-                artist = element.text.strip()
-                if artist and artist not in artists:
-                    artists.append(artist)
+        raw_artists = [
+            element.text
+            for selector in artist_selectors
+            for element in soup.select(selector)
+        ]
 
-        return artists
+        # Ordered de-duplication
+        return list(dict.fromkeys(a.strip() for a in raw_artists if a.strip()))
 
     def _extract_genres(self, soup) -> List[str]:
         """Extract genre information using MangaBuddy-specific selectors."""
-        genres = []
+        raw_genres = []
 
         # Use the specific MangaBuddy genre selector
         genre_p = soup.find('p', string=lambda text: text and 'Genres :' in text)
         if genre_p:
-            genre_links = genre_p.find_all('a')
-            for link in genre_links:
-                genre = link.text.strip()
-                if genre and genre not in genres:
-                    genres.append(genre)
+            raw_genres = [link.text for link in genre_p.find_all('a')]
 
         # Fallback to generic selectors if specific one doesn't work
-        if not genres:
+        if not any(g.strip() for g in raw_genres):
             genre_selectors = ['.manga-genres', '.genres', '.genre', '[itemprop="genre"]']
-            for selector in genre_selectors:
-                genre_elements = soup.select(selector)
-                for element in genre_elements:
-                    genre = element.text.strip()
-                    if genre and genre not in genres:
-                        genres.append(genre)
-
-        return genres
+            raw_genres = [
+                element.text
+                for selector in genre_selectors
+                for element in soup.select(selector)
+            ]
+
+        # Ordered de-duplication
+        return list(dict.fromkeys(g.strip() for g in raw_genres if g.strip()))
 
     def _extract_status(self, soup) -> str:
         """Extract publication status."""
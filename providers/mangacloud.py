@@ -1,9 +1,13 @@
 from typing import List, Optional
+import json as _json
+import random
+import re
 import time
 import httpx
 from bs4 import BeautifulSoup
 
-from core.base_provider import BaseProvider
+from core.base_provider import BaseProvider, ProviderError
+from core.utils import create_http_client, parse_json, TTLCache
 from models import MangaSearchResult, MangaInfo, Chapter
 
 
@@ -15,6 +19,50 @@ class MangaCloudProvider(BaseProvider):
     api_base = "https://api.mangacloud.org"
     image_cdn_base = "https://pika.mangacloud.org"
 
+    # Fallback cache lifetimes (seconds) by endpoint prefix, used when the
+    # API sends no Cache-Control max-age. comic/{id} carries the chapter
+    # list, so it gets the short chapter-list TTL.
+    cache_ttls = (
+        ("chapter/", 6 * 60 * 60),
+        ("comic/", 15 * 60),
+    )
+    _MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+    _CSV_RE = re.compile(r"\s*,\s*")
+
+    def __init__(self):
+        super().__init__()
+        # Pooled (HTTP/2 when available) client so API calls and concurrent
+        # image downloads reuse the same TCP+TLS connections
+        self.session.close()
+        self.session = create_http_client(headers=self.get_headers(), retries=3)
+        self._response_cache = TTLCache(maxsize=256)
+        # Separate CDN client: a handful of multiplexed connections serve all
+        # image downloads, with transport-level retries on connect errors
+        self.image_session = create_http_client(
+            headers={**self.get_headers(), "Accept": "image/webp,image/apng,image/*,*/*;q=0.8"},
+            max_connections=8,
+            max_keepalive_connections=8,
+            retries=2,
+        )
+
+    @staticmethod
+    def _backoff_delay(attempt: int, resp: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else jittered exponential."""
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(60.0, float(retry_after))
+        return min(8.0, 2.0 ** attempt) + random.uniform(0, 1)
+
+    def _cache_ttl(self, endpoint: str, resp: httpx.Response) -> float:
+        match = self._MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+        if match and int(match.group(1)) > 0:
+            return float(match.group(1))
+        for prefix, ttl in self.cache_ttls:
+            if endpoint.startswith(prefix):
+                return float(ttl)
+        return 15 * 60.0
+
     def get_headers(self) -> dict:
         headers = super().get_headers()
         headers.update({
@@ -24,66 +72,89 @@ class MangaCloudProvider(BaseProvider):
         })
         return headers
 
-    def _api_get(self, endpoint: str, params: Optional[dict] = None, retries: int = 3) -> dict:
-        url = f"{self.api_base}/{endpoint.lstrip('/')}"
-        for attempt in range(retries):
-            try:
-                resp = self.session.get(url, params=params)
-                resp.raise_for_status()
-                return resp.json()
-            except httpx.RequestError as e:
-                if attempt == retries - 1:
-                    raise e
-                time.sleep(2 ** attempt)
-            except httpx.HTTPStatusError as e:
-                if attempt == retries - 1:
-                    raise e
-                time.sleep(2 ** attempt)
-        return {}
+    def _api_call(self, method: str, endpoint: str, *, params: Optional[dict] = None,
+                  json: Optional[dict] = None, retries: int = 3) -> dict:
+        endpoint = endpoint.lstrip('/')
+        url = f"{self.api_base}/{endpoint}"
+        if json is not None:
+            body_key = _json.dumps(json, sort_keys=True)
+        else:
+            body_key = tuple(sorted(params.items())) if params else ()
+        cache_key = (method, url, body_key)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-    def _api_post(self, endpoint: str, payload: dict, retries: int = 3) -> dict:
-        url = f"{self.api_base}/{endpoint.lstrip('/')}"
         for attempt in range(retries):
             try:
-                resp = self.session.post(url, json=payload)
+                resp = self.session.request(method, url, params=params, json=json)
                 resp.raise_for_status()
-                return resp.json()
+                data = parse_json(resp.content)
+                self._response_cache.set(cache_key, data, self._cache_ttl(endpoint, resp))
+                return data
             except httpx.RequestError as e:
                 if attempt == retries - 1:
                     raise e
-                time.sleep(2 ** attempt)
+                time.sleep(self._backoff_delay(attempt))
             except httpx.HTTPStatusError as e:
-                if attempt == retries - 1:
+                code = e.response.status_code
+                # Other client errors will not succeed on retry
+                if attempt == retries - 1 or (400 <= code < 500 and code != 429):
                     raise e
-                time.sleep(2 ** attempt)
+                time.sleep(self._backoff_delay(attempt, e.response))
         return {}
 
+    @classmethod
+    def _csv(cls, value) -> List[str]:
+        """Split a comma-separated API field, trimming blanks in one regex pass."""
+        if not value:
+            return []
+        text = value if isinstance(value, str) else str(value)
+        return [part for part in cls._CSV_RE.split(text.strip()) if part]
+
+    def _fetch_comic(self, manga_id: str) -> dict:
+        """Comic detail payload shared by get_manga_info and get_chapters.
+
+        Backed by the response cache, so showing a manga and then listing
+        its chapters costs a single request.
+        """
+        return self._api_call("GET", f"comic/{manga_id}").get("data", {})
+
+    def close(self) -> None:
+        """Release the API and CDN connection pools."""
+        self.session.close()
+        self.image_session.close()
+
+    def clear_cache(self) -> None:
+        """Drop cached API responses (e.g. when the user asks for a refresh)."""
+        self._response_cache.clear()
+
     def search(self, query: str, page: int = 1) -> tuple[List[MangaSearchResult], bool]:
         if page > 1:
             return [], False
 
         payload = {"title": query}
-        resp = self._api_post("comic/browse", payload)
+        resp = self._api_call("POST", "comic/browse", json=payload)
         comics = resp.get("data", [])
         if not isinstance(comics, list):
             comics = [comics]
 
+        cdn = self.image_cdn_base
+        pid = self.provider_id
+        comic_base = f"{self.base_url}/comic/"
+
         results = []
         for comic in comics:
             comic_id = str(comic.get("id", ""))
             cover = comic.get("cover")
-            cover_url = ""
-            if cover:
-                cover_url = f"{self.image_cdn_base}/{comic_id}/{cover['id']}.{cover.get('f', 'jpeg')}"
+            cover_url = f"{cdn}/{comic_id}/{cover['id']}.{cover.get('f', 'jpeg')}" if cover else ""
 
-            title_val = comic.get("title") or "Unknown"
-            
             results.append(MangaSearchResult(
-                provider_id=self.provider_id,
+                provider_id=pid,
                 manga_id=comic_id,
-                title=str(title_val),
+                title=comic.get("title") or "Unknown",
                 cover_url=cover_url,
-                url=f"{self.base_url}/comic/{comic_id}"
+                url=comic_base + comic_id
             ))
 
         return results, False
@@ -95,88 +166,78 @@ class MangaCloudProvider(BaseProvider):
         if not manga_id:
             raise ValueError("Must provide manga_id or url")
 
-        resp = self._api_get(f"comic/{manga_id}")
-        comic = resp.get("data", {})
+        comic = self._fetch_comic(manga_id)
 
         tags = comic.get("tags", [])
-        genres = [str(t["name"]) for t in tags if t.get("type") == "genre"]
+        genres = [t["name"] for t in tags if t.get("type") == "genre"]
 
         cover_url = ""
         cover = comic.get("cover")
         if cover:
             cover_url = f"{self.image_cdn_base}/{manga_id}/{cover['id']}.{cover.get('f', 'jpeg')}"
 
-        authors_str = comic.get("authors") or ""
-        authors = [a.strip() for a in str(authors_str).split(",") if a.strip()]
-
-        artists_str = comic.get("artists") or ""
-        artists = [a.strip() for a in str(artists_str).split(",") if a.strip()]
-
-        alt_titles_str = comic.get("alt_titles") or ""
-        alt_titles = [t.strip() for t in str(alt_titles_str).split(",") if t.strip()]
+        authors = self._csv(comic.get("authors"))
+        artists = self._csv(comic.get("artists"))
+        alt_titles = self._csv(comic.get("alt_titles"))
 
         start_year = comic.get("start_year")
         try:
             year = int(start_year) if start_year else None
         except (ValueError, TypeError):
             year = None
-            
-        title_val = comic.get("title") or "Unknown"
-        status_val = comic.get("status") or "Unknown"
-        desc_val = comic.get("description") or ""
 
         return MangaInfo(
             provider_id=self.provider_id,
             manga_id=manga_id,
-            title=str(title_val),
+            title=comic.get("title") or "Unknown",
             alternative_titles=alt_titles,
             cover_url=cover_url,
             url=f"{self.base_url}/comic/{manga_id}",
-            description=str(desc_val),
+            description=comic.get("description") or "",
             authors=authors,
             artists=artists,
             genres=genres,
-            status=str(status_val),
+            status=comic.get("status") or "Unknown",
             year=year
         )
 
     def get_chapters(self, manga_id: str) -> List[Chapter]:
-        resp = self._api_get(f"comic/{manga_id}")
-        comic = resp.get("data", {})
+        comic = self._fetch_comic(manga_id)
         raw_chapters = comic.get("chapters", [])
 
-        chapters = []
-        for ch in raw_chapters:
-            ch_num = str(ch.get("number", ""))
-            ch_name = str(ch.get("name") or "").strip()
-            ch_id = str(ch.get("id", ""))
-            date_val = str(ch.get("created_date") or "")[:10]
+        chapter_base = f"{self.base_url}/chapter/"
 
-            chapters.append(Chapter(
-                chapter_id=ch_id,
+        # API returns newest first. The required order is oldest first.
+        return [
+            Chapter(
+                chapter_id=(ch_id := str(ch.get("id", ""))),
                 manga_id=manga_id,
-                title=ch_name,
-                chapter_number=ch_num,
+                title=str(ch.get("name") or "").strip(),
+                chapter_number=str(ch.get("number", "")),
                 volume=None,
-                url=f"{self.base_url}/chapter/{ch_id}",
-                release_date=date_val,
+                url=chapter_base + ch_id,
+                release_date=str(ch.get("created_date") or "")[:10],
                 language="en"
-            ))
-
-        # API returns newest first. The required order is oldest first.
-        chapters.reverse()
-        return chapters
+            )
+            for ch in reversed(raw_chapters)
+        ]
 
     def get_chapter_images(self, chapter_id: str) -> List[str]:
-        resp = self._api_get(f"chapter/{chapter_id}")
+        resp = self._api_call("GET", f"chapter/{chapter_id}")
         data = resp.get("data", {})
-        comic_id_val = str(data.get("comic_id", ""))
         images = data.get("images", [])
 
-        urls = []
-        for img in images:
-            img_id = str(img.get("id", ""))
-            fmt = str(img.get("f", "webp"))
-            urls.append(f"{self.image_cdn_base}/{comic_id_val}/{chapter_id}/{img_id}.{fmt}")
+        prefix = f"{self.image_cdn_base}/{data.get('comic_id', '')}/{chapter_id}/"
+        return [
+            f"{prefix}{img.get('id', '')}.{img.get('f', 'webp')}"
+            for img in images
+            if img
+        ]
 
-        return urls
+    def download_image(self, url: str) -> bytes:
+        try:
+            resp = self.image_session.get(url)
+            resp.raise_for_status()
+            return resp.content
+        except Exception as e:
+            raise ProviderError(f"Failed to download image: {e}")
@@ -1,16 +1,22 @@
 import os
 import re
 import json
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 from typing import List, Optional
 
 import httpx
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
 from core.base_provider import BaseProvider, ProviderError
 from core.config import Config
+from core.utils import create_http_client, parse_json, TTLCache
 from models import MangaSearchResult, MangaInfo, Chapter
 
 try:
@@ -20,6 +26,83 @@ except ImportError:
     sync_playwright = None # type: ignore
     PLAYWRIGHT_AVAILABLE = False
 
+try:
+    import numpy as np # type: ignore
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None # type: ignore
+    NUMPY_AVAILABLE = False
+
+
+class PagePool:
+    """
+    Pool of reusable Playwright pages for one browser context.
+
+    Opening a page per VRF/chapter lookup is expensive, so idle pages are
+    kept and handed out again. A page is closed after ``max_uses`` uses to
+    keep long runs from accumulating renderer memory.
+
+    Sync Playwright objects are bound to the thread that created them, so
+    the pool belongs to one thread (MangaFireProvider's browser thread)
+    and refuses to hand out pages anywhere else.
+    """
+
+    def __init__(self, context, max_uses: int = 50):
+        self._context = context
+        self._idle = deque()
+        self._uses = {}
+        self._owner = threading.get_ident()
+        self.max_uses = max_uses
+
+    def _check_thread(self) -> None:
+        if threading.get_ident() != self._owner:
+            raise RuntimeError("PagePool used outside the thread that owns its browser")
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a page; it is returned to the pool when the block exits."""
+        self._check_thread()
+        page = None
+        try:
+            while self._idle and page is None:
+                candidate = self._idle.popleft()
+                if not candidate.is_closed():
+                    page = candidate
+            if page is None:
+                page = self._context.new_page()
+                self._uses[page] = 0
+            yield page
+        finally:
+            if page is not None:
+                self._release(page)
+
+    def _release(self, page) -> None:
+        self._uses[page] = self._uses.get(page, 0) + 1
+        if page.is_closed() or self._uses[page] >= self.max_uses:
+            self._discard(page)
+            return
+        try:
+            # Drop the previous document so idle pages stay lightweight
+            page.goto("about:blank")
+        except Exception:
+            self._discard(page)
+            return
+        self._idle.append(page)
+
+    def _discard(self, page) -> None:
+        self._uses.pop(page, None)
+        try:
+            if not page.is_closed():
+                page.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Close every idle page."""
+        self._check_thread()
+        while self._idle:
+            self._discard(self._idle.popleft())
+
 
 class MangaFireProvider(BaseProvider):
     provider_id = "mangafire"
@@ -29,9 +112,33 @@ class MangaFireProvider(BaseProvider):
     def __init__(self):
         self.config = Config()
         super().__init__()
+        # Pooled (HTTP/2 when available) client shared by the downloader threads
+        self.session.close()
+        self.session = create_http_client(headers=self.get_headers())
+        # Image CDN client: few multiplexed connections, retried on connect errors
+        self.image_session = create_http_client(
+            headers={**self.get_headers(), "Accept": "image/webp,image/apng,image/*,*/*;q=0.8"},
+            max_connections=8,
+            max_keepalive_connections=8,
+            retries=2,
+        )
+        # Manga pages and chapter lists are re-requested on every menu step
+        self._response_cache = TTLCache(maxsize=128)
         self._playwright = None
         self._browser = None
         self._context = None
+        self._page_pool: Optional[PagePool] = None
+        # Every Playwright call runs on this one thread: sync Playwright
+        # objects cannot be used from the downloader's worker threads, so
+        # their browser work is queued here and runs one call at a time
+        self._browser_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mangafire-browser"
+        )
+        self._browser_thread: Optional[int] = None
+        # Search VRF tokens depend only on the keyword, so one capture
+        # serves every results page for that query; bounded and expired
+        # so a long session does not keep every keyword ever searched
+        self._vrf_cache = TTLCache(maxsize=64, ttl=30 * 60)
 
     def get_headers(self) -> dict:
         headers = super().get_headers()
@@ -42,11 +149,66 @@ class MangaFireProvider(BaseProvider):
         })
         return headers
 
+    # CSS selectors compiled once at class load
+    _SEL_SEARCH_ITEM = sv.compile(".original.card-lg .unit .inner")
+    _SEL_SEARCH_LINK = sv.compile(".info > a")
+    _SEL_IMG = sv.compile("img")
+    _SEL_NEXT_PAGE = sv.compile(".pagination .page-item a[rel='next']")
+    _SEL_MAIN = sv.compile(".main-inner:not(.manga-bottom)")
+    _SEL_H1 = sv.compile("h1")
+    _SEL_POSTER = sv.compile(".poster img")
+    _SEL_STATUS = sv.compile(".info > p")
+    _SEL_ALT_TITLE = sv.compile("h6")
+    _SEL_SYNOPSIS = sv.compile("#synopsis .modal-content")
+    _SEL_META = sv.compile(".meta")
+    _SEL_SPAN = sv.compile("span")
+    _SEL_LI = sv.compile("li")
+    _SEL_A = sv.compile("a")
+
+    # Cache lifetimes (seconds) for fetched pages
+    manga_page_ttl = 6 * 60 * 60
+    chapter_list_ttl = 15 * 60
+
+    def _get_text_cached(self, url: str, ttl: float) -> str:
+        """GET url and return the body, reusing a recent response if cached."""
+        text = self._response_cache.get(url)
+        if text is None:
+            resp = self.session.get(url)
+            resp.raise_for_status()
+            text = resp.text
+            self._response_cache.set(url, text, ttl)
+        return text
+
+    def _parse_html(self, html: str) -> BeautifulSoup:
+        # lxml's C parser is far faster than html.parser on full pages
+        return BeautifulSoup(html, "lxml")
+
+    # Subresources never needed to obtain ajax/read or VRF tokens
+    _BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+    _BLOCKED_HOSTS_RE = re.compile(r"googletagmanager|google-analytics|doubleclick|analytics")
+
+    @classmethod
+    def _route_filter(cls, route):
+        request = route.request
+        if (request.resource_type in cls._BLOCKED_RESOURCE_TYPES
+                or cls._BLOCKED_HOSTS_RE.search(urlparse(request.url).netloc)):
+            route.abort()
+        else:
+            route.continue_()
+
+    def _run_on_browser_thread(self, fn, *args):
+        """Run fn(*args) on the browser thread and return its result."""
+        if threading.get_ident() == self._browser_thread:
+            return fn(*args)
+        return self._browser_executor.submit(fn, *args).result()
+
     def _ensure_browser(self):
+        # Called on the browser thread only
         if not PLAYWRIGHT_AVAILABLE:
             raise ProviderError("Playwright is not installed. Run 'pip install playwright' and 'playwright install chromium'")
-            
+
         if not self._context:
+            self._browser_thread = threading.get_ident()
             self._playwright = sync_playwright().start() # type: ignore
             self._browser = self._playwright.chromium.launch(
                 headless=True,
@@ -57,8 +219,23 @@ class MangaFireProvider(BaseProvider):
                 viewport={"width": 1280, "height": 800},
                 ignore_https_errors=True
             )
+            # Only documents, scripts and XHRs are needed on every page
+            self._context.route("**/*", self._route_filter)
+            self._page_pool = PagePool(self._context)
+
+    def close(self) -> None:
+        """Release the HTTP connection pools and shut the browser down."""
+        self.session.close()
+        self.image_session.close()
+        if self._context:
+            self._run_on_browser_thread(self._close_browser)
+        self._browser_executor.shutdown(wait=False)
 
     def _close_browser(self):
+        # Browser thread only, like every other Playwright call
+        if self._page_pool:
+            self._page_pool.close()
+            self._page_pool = None
         if self._context:
             self._context.close()
             self._context = None
@@ -70,9 +247,11 @@ class MangaFireProvider(BaseProvider):
             self._playwright = None
 
     def _get_search_vrf(self, query: str) -> Optional[str]:
+        return self._run_on_browser_thread(self._capture_search_vrf, query)
+
+    def _capture_search_vrf(self, query: str) -> Optional[str]:
         self._ensure_browser()
-        assert self._context is not None
-        page = self._context.new_page()
+        assert self._page_pool is not None
         captured_vrf = None
 
         def on_request(req):
@@ -83,22 +262,25 @@ class MangaFireProvider(BaseProvider):
                 if val:
                     captured_vrf = val
 
-        page.on("request", on_request)
-
-        try:
-            page.goto(f"{self.base_url}/home", wait_until="networkidle", timeout=30000)
-            search_input = page.locator(".search-inner input[name=keyword]")
-            search_input.fill(query)
-            search_input.press("Enter")
-            
-            for _ in range(20):
-                if captured_vrf:
-                    break
-                page.wait_for_timeout(500)
-        except Exception as e:
-            pass
-        finally:
-            page.close()
+        with self._page_pool.acquire() as page:
+            page.on("request", on_request)
+
+            try:
+                # With assets blocked "load" arrives quickly and guarantees
+                # the search box handlers are attached
+                page.goto(f"{self.base_url}/home", wait_until="load", timeout=30000)
+                search_input = page.locator(".search-inner input[name=keyword]")
+                search_input.fill(query)
+                search_input.press("Enter")
+
+                for _ in range(20):
+                    if captured_vrf:
+                        break
+                    page.wait_for_timeout(500)
+            except Exception as e:
+                pass
+            finally:
+                page.remove_listener("request", on_request)
 
         return captured_vrf
 
@@ -110,38 +292,50 @@ class MangaFireProvider(BaseProvider):
             "sort": "most_relevance",
         }
 
-        if query.strip():
-            vrf = self._get_search_vrf(query.strip())
+        keyword = query.strip()
+        cached_vrf = self._vrf_cache.get(keyword) if keyword else None
+        if keyword:
+            vrf = cached_vrf or self._get_search_vrf(keyword)
             if vrf:
                 params["vrf"] = vrf
+                self._vrf_cache.set(keyword, vrf)
 
         resp = self.session.get(f"{self.base_url}/filter", params=params)
+        if cached_vrf and resp.status_code in (400, 403):
+            # The site rotated its signing key; capture a fresh token once
+            self._vrf_cache.pop(keyword)
+            vrf = self._get_search_vrf(keyword)
+            if vrf:
+                params["vrf"] = vrf
+                self._vrf_cache.set(keyword, vrf)
+            else:
+                params.pop("vrf", None)
+            resp = self.session.get(f"{self.base_url}/filter", params=params)
         resp.raise_for_status()
         html = resp.text
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self._parse_html(html)
 
         results = []
-        for item in soup.select(".original.card-lg .unit .inner"):
-            link = item.select_one(".info > a")
+        for item in self._SEL_SEARCH_ITEM.select(soup):
+            link = self._SEL_SEARCH_LINK.select_one(item)
             if not link:
                 continue
-            href_val = link.get("href", "")
-            href_str = str(href_val) if href_val else ""
+            href_str = link.get("href") or ""
             title = link.get_text(strip=True)
             mid = href_str.split(".")[-1] if "." in href_str else href_str.split("/")[-1]
-            img = item.select_one("img")
+            img = self._SEL_IMG.select_one(item)
             slug = href_str.lstrip("/manga/") if href_str.startswith("/manga/") else href_str
 
             results.append(MangaSearchResult(
                 provider_id=self.provider_id,
                 manga_id=slug,
                 title=title,
-                cover_url=str(img["src"]) if img else "",
+                cover_url=img.get("src", "") if img else "",
                 url=f"{self.base_url}/manga/{slug}"
             ))
 
         # Check pagination
-        has_next = bool(soup.select_one(".pagination .page-item a[rel='next']"))
+        has_next = bool(self._SEL_NEXT_PAGE.select_one(soup))
         return results, has_next
 
     def get_manga_info(self, manga_id: Optional[str] = None, url: Optional[str] = None) -> MangaInfo:
@@ -152,36 +346,34 @@ class MangaFireProvider(BaseProvider):
             raise ValueError("Must provide manga_id or url")
 
         slug = manga_id.lstrip("/manga/")
-        resp = self.session.get(f"{self.base_url}/manga/{slug}")
-        resp.raise_for_status()
-        html = resp.text
-        soup = BeautifulSoup(html, "html.parser")
+        html = self._get_text_cached(f"{self.base_url}/manga/{slug}", self.manga_page_ttl)
+        soup = self._parse_html(html)
 
-        main = soup.select_one(".main-inner:not(.manga-bottom)")
+        main = self._SEL_MAIN.select_one(soup)
         if not main:
             raise ProviderError(f"Manga not found: {slug}")
 
-        h1 = main.select_one("h1")
+        h1 = self._SEL_H1.select_one(main)
         title = h1.get_text(strip=True) if h1 else "Unknown"
         
-        poster_img = main.select_one(".poster img")
+        poster_img = self._SEL_POSTER.select_one(main)
         thumbnail = poster_img.get("src") if poster_img else ""
         
-        status_el = main.select_one(".info > p")
+        status_el = self._SEL_STATUS.select_one(main)
         status = status_el.get_text(strip=True) if status_el else "Unknown"
         
-        alt_el = main.select_one("h6")
+        alt_el = self._SEL_ALT_TITLE.select_one(main)
         alt_title = alt_el.get_text(strip=True) if alt_el else ""
         alt_titles = [alt_title] if alt_title else []
 
-        synopsis_el = soup.select_one("#synopsis .modal-content")
+        synopsis_el = self._SEL_SYNOPSIS.select_one(soup)
         description = synopsis_el.get_text(strip=True) if synopsis_el else ""
 
         author = ""
         genres = []
-        meta = main.select_one(".meta")
+        meta = self._SEL_META.select_one(main)
         if meta:
-            for span in meta.select("span"):
+            for span in self._SEL_SPAN.select(meta):
                 txt = span.get_text()
                 nxt = span.find_next_sibling("span")
                 if "Author" in txt and nxt:
@@ -196,7 +388,7 @@ class MangaFireProvider(BaseProvider):
             manga_id=slug,
             title=title,
             alternative_titles=alt_titles,
-            cover_url=str(thumbnail) if thumbnail else "",
+            cover_url=thumbnail or "",
             url=f"{self.base_url}/manga/{slug}",
             description=description,
             authors=authors,
@@ -217,40 +409,39 @@ class MangaFireProvider(BaseProvider):
             
         url = f"{self.base_url}/ajax/manga/{numeric_id}/chapter/{pref_lang}"
 
-        resp = self.session.get(url)
-        resp.raise_for_status()
-        data = resp.json()
-        
+        data = parse_json(self._get_text_cached(url, self.chapter_list_ttl))
+
         if "result" not in data:
             return []
 
-        soup = BeautifulSoup(data["result"], "html.parser")
+        soup = self._parse_html(data["result"])
         chapters = []
 
-        for item in soup.select("li"):
-            link = item.select_one("a")
+        for item in self._SEL_LI.select(soup):
+            link = self._SEL_A.select_one(item)
             if not link:
                 continue
             href = link.get("href", "")
             number = item.get("data-number", "0")
-            spans = item.select("span")
+            spans = self._SEL_SPAN.select(item)
             name = spans[0].get_text(strip=True) if spans else ""
             date = spans[1].get_text(strip=True) if len(spans) > 1 else None
 
             # Clean name to avoid "Chapter X - Chapter X" duplication
             clean_name = name
-            if name.lower().startswith(f"chapter {number}".lower()):
-                clean_name = name[len(f"chapter {number}"):].lstrip(" -:")
+            prefix = f"chapter {number}".lower()
+            if name.lower().startswith(prefix):
+                clean_name = name[len(prefix):].lstrip(" -:")
             if clean_name.strip() == "":
                 clean_name = ""
 
-            ch_url = str(href) if str(href).startswith("http") else f"{self.base_url}{href}"
+            ch_url = href if href.startswith("http") else f"{self.base_url}{href}"
             
             chapters.append(Chapter(
                 chapter_id=ch_url,
                 manga_id=manga_id,
                 title=clean_name,
-                chapter_number=str(number),
+                chapter_number=number,
                 volume=None,
                 url=ch_url,
                 release_date=date,
@@ -264,40 +455,17 @@ class MangaFireProvider(BaseProvider):
     def get_chapter_images(self, chapter_id: str) -> List[str]:
         # 'chapter_id' is the URL of the chapter
         full_url = chapter_id
-        
-        self._ensure_browser()
-        assert self._context is not None
-        page = self._context.new_page()
-        captured_url = None
-
-        def on_request(req):
-            nonlocal captured_url
-            url = req.url
-            if "mangafire.to" in url and "ajax/read" in url:
-                if "ajax/read/chapter" in url or "ajax/read/volume" in url:
-                    captured_url = url
-
-        page.on("request", on_request)
-
-        try:
-            page.goto(full_url, wait_until="networkidle", timeout=30000)
-            for _ in range(20):
-                if captured_url:
-                    break
-                page.wait_for_timeout(500)
-        except Exception as e:
-            pass
-        finally:
-            page.close()
 
-        if not captured_url:
+        signed_url, data = self._run_on_browser_thread(self._capture_chapter_data, full_url)
+        if not signed_url:
             raise ProviderError("Could not capture VRF-signed URL for chapter.")
 
-        # Fetch the already-authenticated ajax URL directly
-        resp = self.session.get(captured_url)
-        resp.raise_for_status()
-        data = resp.json()
-        
+        if data is None:
+            # Body was not available from the browser; fetch the signed URL
+            resp = self.session.get(signed_url)
+            resp.raise_for_status()
+            data = parse_json(resp.content)
+
         # MangaFire structures its json as `{"result": {"images": [ [url, v, offset], ... ]}}`
         images = data.get("result", {}).get("images", [])
         
@@ -317,6 +485,41 @@ class MangaFireProvider(BaseProvider):
 
         return result
         
+    def _capture_chapter_data(self, full_url: str):
+        """Load a chapter in the browser; (signed ajax/read URL, JSON body or None)."""
+        self._ensure_browser()
+        assert self._page_pool is not None
+        captured_response = None
+
+        def on_response(response):
+            nonlocal captured_response
+            url = response.url
+            if "mangafire.to" in url and "ajax/read" in url:
+                if "ajax/read/chapter" in url or "ajax/read/volume" in url:
+                    captured_response = response
+
+        data = None
+        with self._page_pool.acquire() as page:
+            page.on("response", on_response)
+
+            try:
+                # ajax/read fires early from page scripts; polled below
+                page.goto(full_url, wait_until="domcontentloaded", timeout=30000)
+                for _ in range(20):
+                    if captured_response:
+                        break
+                    page.wait_for_timeout(500)
+                if captured_response:
+                    # Read the body Chromium already received instead of
+                    # re-requesting the (possibly expiring) signed URL
+                    data = parse_json(captured_response.body())
+            except Exception as e:
+                pass
+            finally:
+                page.remove_listener("response", on_response)
+
+        return (captured_response.url if captured_response else None), data
+
     def download_image(self, url: str) -> bytes:
         # Override download_image to descramble if necessary
         offset = 0
@@ -326,7 +529,7 @@ class MangaFireProvider(BaseProvider):
 
         try:
             logger_debug_message = f"Downloading image: {url}"
-            resp = self.session.get(url, headers={"Accept": "image/webp,image/apng,image/*,*/*;q=0.8"})
+            resp = self.image_session.get(url)
             resp.raise_for_status()
             data = resp.content
             
@@ -351,28 +554,46 @@ class MangaFireProvider(BaseProvider):
         def ceil_div(a, b):
             return (a + b - 1) // b
 
-        img = Image.open(io.BytesIO(image_data)).convert("RGBA")
+        # Pages are opaque and end up as JPEG, so work in RGB from the start
+        # (no RGBA copy, and no second conversion before encoding)
+        img = Image.open(io.BytesIO(image_data))
+        if img.mode != "RGB":
+            img = img.convert("RGB")
         w, h = img.size
-        result = Image.new("RGBA", (w, h))
 
         pw = min(PIECE_SIZE, ceil_div(w, MIN_SPLIT))
         ph = min(PIECE_SIZE, ceil_div(h, MIN_SPLIT))
         xmax = ceil_div(w, pw) - 1
         ymax = ceil_div(h, ph) - 1
 
-        for y in range(ymax + 1):
-            for x in range(xmax + 1):
-                x_dst = pw * x
+        # Source origin of every destination tile; the last row/column stays put
+        x_srcs = [pw * x if x == xmax else pw * ((xmax - x + offset) % xmax) for x in range(xmax + 1)]
+        y_srcs = [ph * y if y == ymax else ph * ((ymax - y + offset) % ymax) for y in range(ymax + 1)]
+
+        if NUMPY_AVAILABLE:
+            # Tile copies become ndarray slice assignments (C memcpy) into a
+            # single destination buffer
+            src = np.asarray(img)
+            out = np.empty_like(src)
+            for y, y_src in enumerate(y_srcs):
                 y_dst = ph * y
-                bw = min(pw, w - x_dst)
                 bh = min(ph, h - y_dst)
-
-                x_src = pw * x if x == xmax else pw * ((xmax - x + offset) % xmax)
-                y_src = ph * y if y == ymax else ph * ((ymax - y + offset) % ymax)
-
-                piece = img.crop((x_src, y_src, x_src + bw, y_src + bh))
-                result.paste(piece, (x_dst, y_dst))
+                for x, x_src in enumerate(x_srcs):
+                    x_dst = pw * x
+                    bw = min(pw, w - x_dst)
+                    out[y_dst:y_dst + bh, x_dst:x_dst + bw] = src[y_src:y_src + bh, x_src:x_src + bw]
+            result = Image.fromarray(out)
+        else:
+            result = Image.new("RGB", (w, h))
+            for y, y_src in enumerate(y_srcs):
+                y_dst = ph * y
+                bh = min(ph, h - y_dst)
+                for x, x_src in enumerate(x_srcs):
+                    x_dst = pw * x
+                    bw = min(pw, w - x_dst)
+                    piece = img.crop((x_src, y_src, x_src + bw, y_src + bh))
+                    result.paste(piece, (x_dst, y_dst))
 
         buf = io.BytesIO()
-        result.convert("RGB").save(buf, format="JPEG", quality=95)
+        result.save(buf, format="JPEG", quality=95, subsampling=2)
         return buf.getvalue()
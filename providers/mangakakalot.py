@@ -5,17 +5,40 @@ requests (reusing the solved cookies + user-agent).
 Images on the CDN use simple referer headers (no extra solve needed).
 
 Requirements:
-    pip install curl-cffi beautifulsoup4 requests
+    pip install curl-cffi lxml requests
     FlareSolverr running at http://localhost:8191
 """
+import asyncio
+import atexit
 import logging
+import random
 import re
-from typing import Dict, List, Optional, Tuple, Type
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple, Type
 from urllib.parse import urljoin, urlparse
 
 import requests as plain_requests  # only for FlareSolverr (local call)
 from curl_cffi import requests as cffi_requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+try:
+    # Transport-level retries with backoff (curl_cffi >= 0.12)
+    from curl_cffi.requests import RetryStrategy
+    CFFI_RETRY_AVAILABLE = True
+except ImportError:
+    CFFI_RETRY_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
 
 from core.base_provider import (
     BaseProvider,
@@ -24,6 +47,7 @@ from core.base_provider import (
     ChapterNotFoundError,
 )
 from core.config import Config
+from core.utils import has_class, node_text, parse_json, parse_tree, TTLCache
 from models import MangaSearchResult, MangaInfo, Chapter
 
 logger = logging.getLogger(__name__)
@@ -31,6 +55,331 @@ logger = logging.getLogger(__name__)
 # FlareSolverr defaults
 DEFAULT_FLARESOLVERR_URL = "http://localhost:8191/v1"
 FLARESOLVERR_SESSION_ID = "mangaforge"
+FLARESOLVERR_SESSION_TTL_MINUTES = 30
+# Re-solve a little before FlareSolverr would rotate the session itself
+SOLVE_MAX_AGE = 25 * 60
+
+# Patterns used per chapter / per manga, compiled once
+# "Chapter N" anywhere wins (group 1); otherwise the first number (group 2)
+_RE_CHAPTER_OR_NUM = re.compile(
+    r"(?:.*?(?:chapter|ch\.?|cap\.)\s*(\d+(?:\.\d+)?)|.*?(\d+(?:\.\d+)?))",
+    re.IGNORECASE | re.DOTALL,
+)
+# Characters that make urlparse split a path segment (query/fragment/params)
+_URL_DELIMS = frozenset("?#;")
+# Relative paths that urljoin would append unchanged
+_RE_PLAIN_PATH = re.compile(r"[\w\-.~/]+", re.ASCII)
+_RE_VOL = re.compile(r"vol(?:ume)?\.?\s*(\d+)", re.IGNORECASE)
+_RE_YEAR = re.compile(r"(19|20)\d{2}")
+_RE_ALT_SPLIT = re.compile(r"[;,/]|\s{2,}")
+_SEP_CHARS = frozenset(";,/")
+_RE_SPACES = re.compile(r"\s+")
+_RE_PAGE = re.compile(r"[?&]page=(\d+)")
+
+# Request header templates. user-agent/referer are placeholders filled per
+# request; they sit in the reference script's order so the header order
+# on the wire is unchanged.
+_DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36"
+)
+_COMMON_HEADERS: Dict[str, str] = {
+    "user-agent": "",
+    "accept-language": "en-US,en;q=0.9",
+    "accept-encoding": "gzip, deflate, br",
+    "referer": "",
+    "sec-ch-ua": '"Chromium";v="124", "Google Chrome";v="124", '
+    '"Not-A.Brand";v="99"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
+_BASE_API_HEADERS: Dict[str, str] = {
+    **_COMMON_HEADERS,
+    "accept": "application/json, text/plain, */*",
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "same-origin",
+}
+_BASE_HTML_HEADERS: Dict[str, str] = {
+    **_COMMON_HEADERS,
+    "accept": "text/html,application/xhtml+xml,application/xml;"
+    "q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "sec-fetch-dest": "document",
+    "sec-fetch-mode": "navigate",
+    "sec-fetch-site": "same-origin",
+    "upgrade-insecure-requests": "1",
+}
+
+# CDN image headers are fixed (referer-based hotlink protection only), so
+# one module-level dict serves every download
+_IMAGE_HEADERS: Dict[str, str] = {
+    "Referer": "https://www.mangakakalot.gg/",
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Sec-Fetch-Dest": "image",
+    "Sec-Fetch-Mode": "no-cors",
+    "Sec-Fetch-Site": "cross-site",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+# Reader layouts, in the order the reference script tries them
+_CHAPTER_IMAGE_CSS = (
+    "div.container-chapter-reader img",
+    "div.chapter-content img",
+    "div.reader-content img",
+    "div#chapter-content img",
+    "div.pages-chapter-reader img",
+    "div.vung-doc img",
+    "div[class*='chapter'] img",
+)
+# Detail-row labels, already lower-cased: matched case-insensitively
+# against row titles and by str.startswith against lowered row text
+_LABELS_AUTHOR = ("author", "authors")
+_LABELS_ARTIST = ("artist", "artists")
+_LABELS_ALT_TITLES = ("alternative", "other name", "alternative name")
+_LABELS_GENRE = ("genre", "genres")
+_LABELS_STATUS = ("status",)
+_LABELS_YEAR = ("released", "release", "year")
+# Checked in order; the first keyword found in the lowered status wins
+_STATUS_MAP = {"ongoing": "Ongoing", "completed": "Completed", "hiatus": "Hiatus"}
+_NEXT_PAGE_TEXTS = frozenset({"next", ">", ">>", "more", "next page"})
+
+
+# XPath form of _CHAPTER_IMAGE_CSS (the reader <div> each layout needs as
+# an ancestor), for chapter pages when selectolax is not installed
+_CHAPTER_IMAGE_DIVS = (
+    has_class("container-chapter-reader"),
+    has_class("chapter-content"),
+    has_class("reader-content"),
+    "@id = 'chapter-content'",
+    has_class("pages-chapter-reader"),
+    has_class("vung-doc"),
+    "contains(@class, 'chapter')",
+)
+_XP_CHAPTER_IMAGES = tuple(
+    (css, etree.XPath(f"boolean(ancestor::div[{cond}])"))
+    for css, cond in zip(_CHAPTER_IMAGE_CSS, _CHAPTER_IMAGE_DIVS)
+)
+# Union of all layouts: one tree walk collects every candidate <img>
+_XP_ANY_CHAPTER_IMAGE = etree.XPath(
+    "//div[%s]//img" % " or ".join(f"({cond})" for cond in _CHAPTER_IMAGE_DIVS)
+)
+_XP_IMG = etree.XPath("//img")
+
+# Search pages are read with lxml too
+_XP_STORIES = etree.XPath(f"//div[{has_class('story_item')}]")
+# Same matching as the CSS "h3.story_name a" scoped to an item: the h3 may
+# sit outside the item
+_XP_STORY_LINK = etree.XPath(f"(.//a[ancestor::h3[{has_class('story_name')}]])[1]")
+_XP_STORY_IMG = etree.XPath("(.//img)[1]")
+_XP_NEXT_PAGE = etree.XPath(
+    "boolean("
+    f"//*[{has_class('pagination')}]//*[{has_class('next')}]"
+    f" | //*[{has_class('pagination')}]//a[contains(@href, 'page')]"
+    " | //a[contains(@href, '?page=')]"
+    f" | //*[{has_class('page-nav')}]//*[{has_class('next')}]"
+    f" | //*[{has_class('pager')}]//*[{has_class('next')}]"
+    ")"
+)
+_XP_PAGE_LINKS = etree.XPath(
+    f"//*[{has_class('pagination')}]//a"
+    f" | //*[{has_class('page-nav')}]//a"
+    " | //a[contains(@href, 'page=')]"
+)
+_XP_ANCHORS = etree.XPath("//a")
+
+# Manga detail pages are read with lxml directly: precompiled XPath avoids
+# the BeautifulSoup object wrapping and CSS translation per lookup.
+# Only the first hit of each is used; the (...)[1] form lets libxml2 stop
+# at it where it can instead of collecting every match
+_XP_TITLE = tuple(
+    etree.XPath(f"({expr})[1]")
+    for expr in (
+        f"//ul[{has_class('manga-info-text')}]//h1",
+        f"//*[{has_class('manga-info-content')}]//h1",
+        f"//*[{has_class('story-info-right')}]//h1",
+        "//h1",
+    )
+)
+_XP_COVER = tuple(
+    etree.XPath(f"({expr})[1]")
+    for expr in (
+        f"//div[{has_class('manga-info-pic')}]//img",
+        f"//*[{has_class('manga-info-pic')}]//img",
+        f"//*[{has_class('story-info-left')}]//img",
+        f"//*[{has_class('manga-info-img')}]//img",
+    )
+)
+_XP_ALT_TITLE = etree.XPath(
+    f"(//ul[{has_class('manga-info-text')}]//h2[{has_class('story-alternative')}]"
+    f" | //*[{has_class('story-info-right')}]//h2[{has_class('story-alternative')}])[1]"
+)
+_XP_INFO_LI = etree.XPath(f"//ul[{has_class('manga-info-text')}]//li")
+_XP_DESCRIPTION = etree.XPath(
+    "(//*[@id='panel-story-info-description']"
+    f"//*[{has_class('panel-body')}]"
+    " | //*[@id='panel-story-info-description']"
+    f" | //*[{has_class('panel-story-info-description')}]"
+    f" | //*[{has_class('story-info-right')}]//*[{has_class('description')}])[1]"
+)
+_XP_INFO_RIGHT = etree.XPath(f"(//*[{has_class('story-info-right')}])[1]")
+_XP_DETAIL_TITLES = etree.XPath(f".//*[{has_class('story-info-right-title')}]")
+_XP_DETAIL_VALUES = etree.XPath(f".//*[{has_class('story-info-right-detail')}]")
+_XP_INFO_FALLBACK = etree.XPath(
+    f"(//*[{has_class('manga-info-text')}]"
+    f" | //*[{has_class('manga-info-content')}])[1]"
+)
+
+
+@lru_cache(maxsize=32)
+def _label_patterns(labels: Tuple[str, ...]) -> Tuple[re.Pattern, re.Pattern]:
+    """Case-insensitive matchers for a detail-label group, built once per group.
+
+    The first finds any label inside a row title; the second matches text
+    that starts with a label or contains "label:" anywhere.
+    """
+    alternation = "|".join(re.escape(label) for label in labels)
+    return (
+        re.compile(alternation, re.IGNORECASE),
+        re.compile(f"^(?:{alternation})|(?:{alternation}):", re.IGNORECASE),
+    )
+
+
+def _strip_label(text: str, labels: Tuple[str, ...]) -> Optional[str]:
+    """Value after "Label:" when *text* starts with one of *labels*, else None."""
+    if ":" in text and text.lower().startswith(labels):
+        return text.split(":", 1)[1].strip()
+    return None
+
+
+def _split_values(text: str) -> List[str]:
+    """Split a multi-value field on ; , / or runs of whitespace, dropping blanks."""
+    # Common single-value case: no separator and no whitespace run (every
+    # whitespace char except " " is non-printable), so skip the regex
+    if _SEP_CHARS.isdisjoint(text) and "  " not in text and text.isprintable():
+        value = text.strip()
+        return [value] if value else []
+    return [v for v in (part.strip() for part in _RE_ALT_SPLIT.split(text)) if v]
+
+
+def _match_status(text: str) -> Optional[str]:
+    """Canonical status for *text*, lowering it once; None if unrecognised."""
+    lower = text.lower()
+    for keyword, status in _STATUS_MAP.items():
+        if keyword in lower:
+            return status
+    return None
+
+
+def _copy_info(info: MangaInfo) -> MangaInfo:
+    """Copy of a cached MangaInfo whose list fields the caller may mutate."""
+    return replace(
+        info,
+        alternative_titles=list(info.alternative_titles),
+        authors=list(info.authors),
+        artists=list(info.artists),
+        genres=list(info.genres),
+    )
+
+
+def _loop_running() -> bool:
+    """True when called from inside a running event loop (asyncio.run would fail)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=2048)
+def _absolute_url(base_prefix: str, url_or_path: str) -> str:
+    """Resolve a site-relative path against *base_prefix* (base URL + "/").
+
+    Absolute URLs pass through. Plain paths are concatenated; urljoin is
+    only needed for dot segments, queries and other characters it rewrites.
+    """
+    if url_or_path.startswith(("http://", "https://")):
+        return url_or_path
+    path = url_or_path.lstrip("/")
+    if (
+        _RE_PLAIN_PATH.fullmatch(path)
+        and "./" not in path
+        and "//" not in path
+        and not path.endswith(".")
+    ):
+        return base_prefix + path
+    return urljoin(base_prefix, path)
+
+
+# Search results and chapter rows hit the same URLs repeatedly, so skip
+# re-running urlparse for ones already seen
+@lru_cache(maxsize=4096)
+def _id_from_url(url: str) -> str:
+    parsed = urlparse(url)
+    return parsed.path.lstrip("/") or parsed.netloc
+
+
+class _DetailIndex:
+    """Label/value nodes of a manga page, walked once and matched per label.
+
+    The new-style layout is indexed up front as (title text, value node)
+    pairs; the old-style fallback list is only built if a label misses.
+    """
+
+    __slots__ = ("_tree", "_pairs", "_fallback")
+
+    def __init__(self, tree: lxml_html.HtmlElement):
+        self._tree = tree
+        self._pairs: List[tuple] = []
+        self._fallback: Optional[List[tuple]] = None
+        info_sections = _XP_INFO_RIGHT(tree)
+        if info_sections:
+            title_elements = _XP_DETAIL_TITLES(info_sections[0])
+            detail_elements = _XP_DETAIL_VALUES(info_sections[0])
+            if len(title_elements) == len(detail_elements):
+                self._pairs = [
+                    (node_text(title_el, " "), detail_el)
+                    for title_el, detail_el in zip(title_elements, detail_elements)
+                ]
+
+    def find(self, labels: Tuple[str, ...]):
+        """Value node for the first entry matching any of *labels*, or None."""
+        # No per-node .lower(): the label groups are compiled once into
+        # case-insensitive patterns
+        in_title, in_text = _label_patterns(labels)
+        for title, detail_el in self._pairs:
+            if in_title.search(title):
+                return detail_el
+
+        if self._fallback is None:
+            fallbacks = _XP_INFO_FALLBACK(self._tree)
+            self._fallback = []
+            if fallbacks:
+                for element in fallbacks[0].iterdescendants("li", "p", "span", "div"):
+                    text = node_text(element, " ")
+                    if text:
+                        self._fallback.append((text, element))
+        for text, element in self._fallback:
+            if in_text.search(text):
+                return element
+        return None
+
+
+def _first(xpaths, tree):
+    """First node matched by the first XPath in *xpaths* that matches at all."""
+    for xp in xpaths:
+        nodes = xp(tree)
+        if nodes:
+            return nodes[0]
+    return None
 
 
 class MangakakalotProvider(BaseProvider):
@@ -44,6 +393,16 @@ class MangakakalotProvider(BaseProvider):
     provider_name = "MangaKakalot"
     base_url = "https://www.mangakakalot.gg"
 
+    # Result cache lifetimes (seconds); chapter lists change more often
+    manga_info_ttl = 60 * 60
+    chapter_list_ttl = 15 * 60
+    page_html_ttl = 5 * 60
+
+    # Latest FlareSolverr solution and when it was obtained, shared by every
+    # instance in the process so a new provider skips the solve
+    _shared_solution: Optional[Tuple[dict, float]] = None
+    _shared_solution_lock = threading.Lock()
+
     def __init__(self) -> None:
         self.config = Config()
         self.retry_attempts = self.config.get("network.retry_attempts", 3)
@@ -61,20 +420,121 @@ class MangakakalotProvider(BaseProvider):
 
         # These will be populated after the first FlareSolverr solve.
         self._cf_user_agent: str = ""
+        # _make_headers results for the current user agent
+        self._headers_cache: Dict[Tuple[str, bool], Dict[str, str]] = {}
         self._cffi_session: Optional[cffi_requests.Session] = None
+        # Cookie-less session for endpoints that may not need a solve
+        self._bare_session: Optional[cffi_requests.Session] = None
         self._solved: bool = False
+        self._solved_at: float = 0.0
+        # The solver response our session was built from
+        self._solution_source: Optional[dict] = None
+        self._fs_session_created: bool = False
+        # Image workers share one session; only one of them may solve
+        self._solve_lock = threading.Lock()
+
+        # Re-opening a manga skips the fetch and parse entirely
+        self._info_cache = TTLCache(maxsize=128, ttl=self.manga_info_ttl)
+        self._chapters_cache = TTLCache(maxsize=128, ttl=self.chapter_list_ttl)
+        # Raw page HTML by URL, so revisits (search pages, retried chapters)
+        # skip the network round trip
+        self._html_cache = TTLCache(maxsize=64, ttl=self.page_html_ttl)
+        # Extracted search results by page URL: paging back and forth
+        # through results skips the parse as well
+        self._search_cache = TTLCache(maxsize=64, ttl=self.page_html_ttl)
+        # Worker pool for batch lookups, created on first use
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Where the chapters API keeps its list; updated if the shape changes
+        self._chapter_list_path: Tuple[str, ...] = ("data", "chapters")
+        # Joined onto relative paths by _ensure_absolute_url
+        self._base_prefix = self.base_url.rstrip("/") + "/"
 
     # ══════════════════════════════════════════════════════════════════════
     #  FlareSolverr integration
     # ══════════════════════════════════════════════════════════════════════
 
+    def _solution_valid(self) -> bool:
+        return (
+            self._solved
+            and self._cffi_session is not None
+            and time.monotonic() - self._solved_at < SOLVE_MAX_AGE
+        )
+
     def _ensure_solved(self) -> None:
-        """Lazily solve the Cloudflare challenge if not done yet."""
-        if self._solved and self._cffi_session is not None:
+        """Lazily solve the Cloudflare challenge if not done yet or stale."""
+        if self._solution_valid():
             return
-        solver_resp = self._flaresolverr_solve(self.base_url)
-        self._build_cffi_session(solver_resp)
-        self._solved = True
+        with self._solve_lock:
+            if self._solution_valid():
+                return
+            solver_resp, solved_at = self._shared_solve()
+            self._build_cffi_session(solver_resp)
+            self._solution_source = solver_resp
+            self._solved = True
+            self._solved_at = solved_at
+
+    def _shared_solve(self) -> Tuple[dict, float]:
+        """A current FlareSolverr solution, reusing one another instance got.
+
+        The shared solution is only reused if it is fresh and is not the one
+        this instance's (now stale or challenged) session was built from.
+        """
+        cls = type(self)
+        with cls._shared_solution_lock:
+            shared = cls._shared_solution
+            if (
+                shared is not None
+                and shared[0] is not self._solution_source
+                and time.monotonic() - shared[1] < SOLVE_MAX_AGE
+            ):
+                logger.debug("[FlareSolverr] Reusing shared solution")
+                return shared
+            self._ensure_flaresolverr_session()
+            solver_resp = self._flaresolverr_solve(self.base_url)
+            cls._shared_solution = (solver_resp, time.monotonic())
+            return cls._shared_solution
+
+    def _invalidate_solution(self) -> None:
+        """Mark the cf_clearance cookies as expired so the next call re-solves."""
+        self._solved = False
+
+    def _ensure_flaresolverr_session(self) -> None:
+        """Create the persistent FlareSolverr browser session once per process.
+
+        Reusing one session lets FlareSolverr keep its browser (and the
+        Cloudflare clearance it earned) between solves instead of
+        launching a fresh one each time.
+        """
+        if self._fs_session_created:
+            return
+        payload = {"cmd": "sessions.create", "session": FLARESOLVERR_SESSION_ID}
+        try:
+            resp = plain_requests.post(
+                self.flaresolverr_url, json=payload, timeout=90
+            )
+            data = parse_json(resp.content)
+        except (plain_requests.exceptions.RequestException, ValueError) as exc:
+            # _flaresolverr_solve reports connection problems properly
+            logger.debug("[FlareSolverr] sessions.create failed: %s", exc)
+            return
+        if data.get("status") != "ok" and "already exists" not in str(
+            data.get("message", "")
+        ):
+            logger.warning(
+                "[FlareSolverr] sessions.create: %s", data.get("message", data)
+            )
+            return
+        self._fs_session_created = True
+        atexit.register(self._destroy_flaresolverr_session)
+
+    def _destroy_flaresolverr_session(self) -> None:
+        payload = {"cmd": "sessions.destroy", "session": FLARESOLVERR_SESSION_ID}
+        try:
+            plain_requests.post(self.flaresolverr_url, json=payload, timeout=10)
+        except plain_requests.exceptions.RequestException:
+            pass
+        self._fs_session_created = False
 
     def _flaresolverr_solve(self, url: str) -> dict:
         """Send a request through FlareSolverr to solve the CF challenge."""
@@ -83,6 +543,7 @@ class MangakakalotProvider(BaseProvider):
             "cmd": "request.get",
             "url": url,
             "session": FLARESOLVERR_SESSION_ID,
+            "session_ttl_minutes": FLARESOLVERR_SESSION_TTL_MINUTES,
             "maxTimeout": 60000,
         }
         try:
@@ -97,7 +558,9 @@ class MangakakalotProvider(BaseProvider):
                 "-p 8191:8191 ghcr.io/flaresolverr/flaresolverr:latest"
             ) from exc
 
-        data = resp.json()
+        # The solution embeds the whole solved page; orjson (when installed)
+        # decodes it straight from bytes
+        data = parse_json(resp.content)
         if data.get("status") != "ok":
             raise ProviderError(
                 f"FlareSolverr error: {data.get('message', data)}"
@@ -113,9 +576,30 @@ class MangakakalotProvider(BaseProvider):
         """Build a curl_cffi session using cookies from FlareSolverr."""
         solution = solver_response["solution"]
         self._cf_user_agent = solution["userAgent"]
+        self._headers_cache.clear()
         cookies = solution["cookies"]
 
-        session = cffi_requests.Session(impersonate="chrome124")
+        # One long-lived session for pages, API and images: curl_cffi keeps a
+        # curl handle per thread, so each downloader worker holds its own
+        # warm keep-alive (HTTP/2 via ALPN) connection instead of
+        # re-handshaking per image.
+        kwargs = {}
+        if CFFI_RETRY_AVAILABLE:
+            # Connection errors and timeouts are retried inside the session,
+            # on the same curl handle (DNS cache, TLS session) with backoff
+            kwargs["retry"] = RetryStrategy(
+                count=max(0, self.retry_attempts - 1),
+                delay=0.5,
+                jitter=0.5,
+                backoff="exponential",
+            )
+        session = cffi_requests.Session(
+            impersonate="chrome124",
+            max_redirects=3,
+            use_thread_local_curl=True,
+            **kwargs,
+        )
+        session.headers.update({"Connection": "keep-alive"})
         for ck in cookies:
             session.cookies.set(
                 ck["name"],
@@ -136,45 +620,21 @@ class MangakakalotProvider(BaseProvider):
     def _make_headers(
         self, referer: str = "", is_api: bool = False
     ) -> dict:
-        """Build request headers matching the reference script."""
-        if not referer:
-            referer = self.base_url
-
-        base: Dict[str, str] = {
-            "user-agent": (
-                self._cf_user_agent
-                or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36"
-            ),
-            "accept-language": "en-US,en;q=0.9",
-            "accept-encoding": "gzip, deflate, br",
-            "referer": referer,
-            "sec-ch-ua": '"Chromium";v="124", "Google Chrome";v="124", '
-            '"Not-A.Brand";v="99"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Windows"',
-        }
-        if is_api:
-            base.update(
-                {
-                    "accept": "application/json, text/plain, */*",
-                    "sec-fetch-dest": "empty",
-                    "sec-fetch-mode": "cors",
-                    "sec-fetch-site": "same-origin",
-                }
-            )
-        else:
-            base.update(
-                {
-                    "accept": "text/html,application/xhtml+xml,application/xml;"
-                    "q=0.9,image/avif,image/webp,*/*;q=0.8",
-                    "sec-fetch-dest": "document",
-                    "sec-fetch-mode": "navigate",
-                    "sec-fetch-site": "same-origin",
-                    "upgrade-insecure-requests": "1",
-                }
-            )
-        return base
+        """Request headers matching the reference script.
+
+        Built once per (referer, kind) for the current user agent and shared
+        between calls, so callers must not mutate the returned dict.
+        """
+        key = (referer or self.base_url, is_api)
+        headers = self._headers_cache.get(key)
+        if headers is None:
+            if len(self._headers_cache) >= 256:
+                self._headers_cache.clear()
+            headers = (_BASE_API_HEADERS if is_api else _BASE_HTML_HEADERS).copy()
+            headers["user-agent"] = self._cf_user_agent or _DEFAULT_UA
+            headers["referer"] = key[0]
+            self._headers_cache[key] = headers
+        return headers
 
     def _cffi_get(
         self,
@@ -182,8 +642,19 @@ class MangakakalotProvider(BaseProvider):
         *,
         headers: Optional[dict] = None,
         timeout: int = 30,
+        allow_bypass: bool = False,
     ) -> cffi_requests.Response:
-        """Perform a GET via the curl_cffi session with retries."""
+        """Perform a GET via the curl_cffi session with retries.
+
+        With ``allow_bypass``, a cold start first tries the URL with only the
+        impersonated TLS fingerprint and skips the FlareSolverr solve if
+        Cloudflare lets that through.
+        """
+        if allow_bypass and not self._solution_valid():
+            resp = self._try_unsolved_get(url, headers=headers, timeout=timeout)
+            if resp is not None:
+                return resp
+
         self._ensure_solved()
         assert self._cffi_session is not None
 
@@ -193,8 +664,42 @@ class MangakakalotProvider(BaseProvider):
                 resp = self._cffi_session.get(
                     url, headers=headers, timeout=timeout
                 )
-                resp.raise_for_status()
-                return resp
+                if self._is_challenge(resp):
+                    # cf_clearance expired mid-run: re-solve before the next
+                    # attempt instead of retrying with the same cookies
+                    logger.info(
+                        "Cloudflare challenge on %s (attempt %d/%d), re-solving",
+                        url,
+                        attempt,
+                        self.retry_attempts,
+                    )
+                    last_exc = ProviderError(
+                        f"Cloudflare challenge (HTTP {resp.status_code})"
+                    )
+                    self._invalidate_solution()
+                    # A re-solve is only worth it if another attempt uses it
+                    if attempt < self.retry_attempts:
+                        self._ensure_solved()
+                    continue
+                code = resp.status_code
+                if code < 400:
+                    return resp
+                last_exc = ProviderError(f"HTTP {code} for {url}")
+                # Other client errors will not succeed on retry
+                if code < 500 and code != 429:
+                    break
+                logger.warning(
+                    "HTTP %d from %s (attempt %d/%d)",
+                    code,
+                    url,
+                    attempt,
+                    self.retry_attempts,
+                )
+                if attempt < self.retry_attempts:
+                    time.sleep(self._backoff_delay(attempt, resp))
+            except ProviderError:
+                # FlareSolverr itself failed; more retries will not help
+                raise
             except Exception as exc:
                 last_exc = exc
                 logger.warning(
@@ -204,17 +709,59 @@ class MangakakalotProvider(BaseProvider):
                     self.retry_attempts,
                     exc,
                 )
-        raise ProviderError(
-            f"Failed to fetch URL after {self.retry_attempts} attempts: {url}"
-        ) from last_exc
+                if CFFI_RETRY_AVAILABLE:
+                    # Already retried with backoff by the session's transport
+                    break
+        raise ProviderError(f"Failed to fetch URL: {url}") from last_exc
+
+    @staticmethod
+    def _backoff_delay(attempt: int, resp: cffi_requests.Response) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else jittered exponential."""
+        retry_after = resp.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(60.0, float(retry_after))
+        return min(10.0, 2.0 ** attempt) + random.uniform(0, 1)
+
+    def _try_unsolved_get(
+        self, url: str, *, headers: Optional[dict], timeout: int
+    ) -> Optional[cffi_requests.Response]:
+        """One GET without cf_clearance cookies; None if it did not succeed."""
+        if self._bare_session is None:
+            self._bare_session = cffi_requests.Session(
+                impersonate="chrome124", max_redirects=3
+            )
+        try:
+            resp = self._bare_session.get(url, headers=headers, timeout=timeout)
+        except Exception as exc:
+            logger.debug("Unsolved request to %s failed: %s", url, exc)
+            return None
+        if 200 <= resp.status_code < 300 and not self._is_challenge(resp):
+            logger.debug("Fetched %s without a Cloudflare solve", url)
+            return resp
+        return None
 
-    def _fetch_soup(
+    @staticmethod
+    def _is_challenge(resp: cffi_requests.Response) -> bool:
+        """True if *resp* is a Cloudflare challenge rather than real content."""
+        if resp.status_code in (403, 503):
+            return True
+        if resp.headers.get("cf-mitigated", "").lower() == "challenge":
+            return True
+        # Sniff the raw bytes: .text would decode the whole body just to look
+        # at its head, and the chapter JSON is never decoded to str otherwise
+        return b"Just a moment" in resp.content[:4096]
+
+    def _fetch_html(
         self,
         url: str,
         referer: str = "",
         not_found_exc: Optional[Type[Exception]] = None,
-    ) -> BeautifulSoup:
-        """Fetch a page and return parsed HTML."""
+    ) -> str:
+        """Fetch a page and return its HTML text (cached briefly per URL)."""
+        cached = self._html_cache.get(url)
+        if cached is not None:
+            return cached
+
         headers = self._make_headers(referer or self.base_url)
         try:
             resp = self._cffi_get(url, headers=headers, timeout=self.timeout)
@@ -222,49 +769,90 @@ class MangakakalotProvider(BaseProvider):
             if not_found_exc:
                 raise not_found_exc(f"Resource not found: {url}")
             raise
+        html = resp.text
+        self._html_cache.set(url, html)
+        return html
 
-        try:
-            return BeautifulSoup(resp.text, "lxml")
-        except Exception:
-            return BeautifulSoup(resp.text, "html.parser")
+    def _fetch_tree(
+        self,
+        url: str,
+        referer: str = "",
+        not_found_exc: Optional[Type[Exception]] = None,
+    ) -> lxml_html.HtmlElement:
+        """Fetch a page and return it as an lxml element tree."""
+        html = self._fetch_html(url, referer, not_found_exc)
+        if not html.strip():
+            raise (not_found_exc or ProviderError)(f"Empty page: {url}")
+        return lxml_html.fromstring(html)
 
     # ══════════════════════════════════════════════════════════════════════
     #  Public API — search
     # ══════════════════════════════════════════════════════════════════════
 
-    def search(self, query: str, page: int = 1) -> Tuple[List[MangaSearchResult], bool]:
+    def search(
+        self, query: str, page: int = 1, limit: Optional[int] = None
+    ) -> Tuple[List[MangaSearchResult], bool]:
+        """Search MangaKakalot; *limit* stops parsing after that many results.
+
+        A truncated page is not cached, so a later full search still parses
+        every row; a cached page is simply sliced.
+        """
         logger.debug("Searching MangaKakalot for '%s' (page %s)", query, page)
 
         if not query.strip():
             return [], False
 
-        search_slug = re.sub(r"\s+", "_", query.strip())
+        search_slug = _RE_SPACES.sub("_", query.strip())
         search_url = f"{self.base_url}/search/story/{search_slug}"
         if page > 1:
             search_url += f"?page={page}"
 
-        soup = self._fetch_soup(search_url)
+        cached = self._search_cache.get(search_url)
+        if cached is not None:
+            results, has_next = cached
+            return [replace(result) for result in results[:limit]], has_next
+
+        html = self._fetch_html(search_url)
+        if not html.strip():
+            return [], False
+        tree = lxml_html.fromstring(html)
 
         results: List[MangaSearchResult] = []
-        seen_urls: set[str] = set()
+        seen_hrefs: set[str] = set()
+        seen_ids: set[str] = set()
+        truncated = False
+
+        for item in _XP_STORIES(tree):
+            if limit is not None and len(results) >= limit:
+                truncated = True
+                break
+            links = _XP_STORY_LINK(item)
+            if not links:
+                continue
+            link = links[0]
 
-        for item in soup.select("div.story_item"):
-            link = item.select_one("h3.story_name a")
-            if not link:
+            # Repeated rows usually carry the identical href: drop them
+            # before any URL normalisation or cover/title work
+            href = link.get("href", "")
+            if not href or href in seen_hrefs:
                 continue
+            seen_hrefs.add(href)
 
-            manga_url = self._ensure_absolute_url(link.get("href", ""))
-            if not manga_url or manga_url in seen_urls:
+            # Dedupe on the manga id so the same series linked with a query
+            # string, fragment or trailing slash is only listed once
+            manga_url = self._ensure_absolute_url(href)
+            manga_id = self._extract_id_from_url(manga_url)
+            id_key = manga_id.rstrip("/")
+            if id_key in seen_ids:
                 continue
 
-            seen_urls.add(manga_url)
-            title = link.get_text(strip=True)
-            cover_el = item.select_one("img")
+            seen_ids.add(id_key)
+            title = node_text(link)
+            cover_els = _XP_STORY_IMG(item)
             cover_url = ""
-            if cover_el:
-                cover_url = cover_el.get("data-src") or cover_el.get("src") or ""
+            if cover_els:
+                cover_url = cover_els[0].get("data-src") or cover_els[0].get("src") or ""
 
-            manga_id = self._extract_id_from_url(manga_url)
             result = MangaSearchResult(
                 provider_id=self.provider_id,
                 manga_id=manga_id,
@@ -274,7 +862,11 @@ class MangakakalotProvider(BaseProvider):
             )
             results.append(result)
 
-        has_next = self._has_next_page(soup)
+        has_next = self._has_next_page(tree)
+        if not truncated:
+            self._search_cache.set(
+                search_url, (tuple(replace(result) for result in results), has_next)
+            )
         logger.info(
             "MangaKakalot search returned %d results (has_next=%s)",
             len(results),
@@ -293,14 +885,18 @@ class MangakakalotProvider(BaseProvider):
             raise ValueError("Either manga_id or url must be provided")
 
         target_url = self._ensure_absolute_url(url or manga_id)
+        cache_key = (target_url, manga_id)
+        cached = self._info_cache.get(cache_key)
+        if cached is not None:
+            return _copy_info(cached)
         logger.debug("Fetching MangaKakalot manga info from %s", target_url)
 
-        soup = self._fetch_soup(
-            target_url, not_found_exc=MangaNotFoundError
-        )
+        tree = self._fetch_tree(target_url, not_found_exc=MangaNotFoundError)
+        # Detail rows are walked once here and looked up by each extractor
+        details = _DetailIndex(tree)
 
         # ── Title (reference: ul.manga-info-text h1) ──
-        title = self._extract_title(soup)
+        title = self._extract_title(tree)
         if not title:
             raise MangaNotFoundError(
                 f"Could not extract title for URL: {target_url}"
@@ -309,22 +905,19 @@ class MangakakalotProvider(BaseProvider):
         extracted_manga_id = self._extract_id_from_url(target_url)
 
         # ── Cover (reference: div.manga-info-pic img) ──
-        cover_url = self._extract_cover_url(soup)
+        cover_url = self._extract_cover_url(tree)
 
         # ── Alternative titles (reference: h2.story-alternative) ──
-        alt_el = soup.select_one(
-            "ul.manga-info-text h2.story-alternative, "
-            ".story-info-right h2.story-alternative"
-        )
-        if alt_el:
-            raw_alt = alt_el.get_text(strip=True)
+        alt_nodes = _XP_ALT_TITLE(tree)
+        if alt_nodes:
+            lower_title = title.lower()
             alternative_titles = [
-                a.strip()
-                for a in re.split(r"[;,/]|\s{2,}", raw_alt)
-                if a.strip() and a.strip().lower() != title.lower()
+                alt
+                for alt in _split_values(node_text(alt_nodes[0]))
+                if alt.lower() != lower_title
             ]
         else:
-            alternative_titles = self._extract_alternative_titles(soup, title)
+            alternative_titles = self._extract_alternative_titles(details, title)
 
         # ── Extract fields from ul.manga-info-text li (reference approach) ──
         authors: List[str] = []
@@ -332,46 +925,32 @@ class MangakakalotProvider(BaseProvider):
         status = "Unknown"
         description = ""
 
-        for li in soup.select("ul.manga-info-text li"):
-            text = li.get_text(" ", strip=True)
+        for li in _XP_INFO_LI(tree):
+            text = node_text(li, " ")
             if "Author" in text:
-                authors = [
-                    a.get_text(strip=True) for a in li.select("a")
-                ] or []
+                authors = [node_text(a) for a in li.iterdescendants("a")]
             elif text.startswith("Status"):
                 raw_status = text.replace("Status :", "").replace("Status:", "").strip()
-                lower_s = raw_status.lower()
-                if "ongoing" in lower_s:
-                    status = "Ongoing"
-                elif "completed" in lower_s:
-                    status = "Completed"
-                elif "hiatus" in lower_s:
-                    status = "Hiatus"
-                else:
-                    status = raw_status or "Unknown"
+                status = _match_status(raw_status) or raw_status or "Unknown"
             elif text.startswith("Genres") or text.startswith("Genre"):
-                genres = [
-                    a.get_text(strip=True) for a in li.select("a")
-                ]
+                genres = [node_text(a) for a in li.iterdescendants("a")]
 
         # Fallback to generic detail extraction if the old-style selectors
         # didn't find anything (new-style layout).
         if not authors:
-            authors = self._extract_person_list(soup, ["Author", "Authors"])
+            authors = self._extract_person_list(details, _LABELS_AUTHOR)
         if not genres:
-            genres = self._extract_genres(soup)
+            genres = self._extract_genres(details)
         if status == "Unknown":
-            status = self._extract_status(soup)
+            status = self._extract_status(details)
 
-        artists = self._extract_person_list(
-            soup, ["Artist", "Artists"]
-        ) or authors
+        artists = self._extract_person_list(details, _LABELS_ARTIST) or authors
 
         # ── Description ──
-        description = self._extract_description(soup)
+        description = self._extract_description(tree)
 
         # ── Year ──
-        year = self._extract_year(soup)
+        year = self._extract_year(details)
 
         manga_info = MangaInfo(
             provider_id=self.provider_id,
@@ -388,8 +967,9 @@ class MangakakalotProvider(BaseProvider):
             year=year,
         )
 
+        self._info_cache.set(cache_key, manga_info)
         logger.info("Fetched MangaKakalot manga info for '%s'", title)
-        return manga_info
+        return _copy_info(manga_info)
 
     # ══════════════════════════════════════════════════════════════════════
     #  Public API — chapters (API-based, from reference script)
@@ -404,48 +984,89 @@ class MangakakalotProvider(BaseProvider):
         chapters_api = f"{self.base_url}/api/manga/{slug}/chapters?limit=-1"
         manga_page_url = f"{self.base_url}/manga/{slug}"
 
+        cache_key = (chapters_api, manga_id)
+        cached = self._chapters_cache.get(cache_key)
+        if cached is not None:
+            return [replace(chapter) for chapter in cached]
+
         logger.debug("Fetching MangaKakalot chapters API: %s", chapters_api)
 
         headers = self._make_headers(manga_page_url, is_api=True)
-        resp = self._cffi_get(chapters_api, headers=headers, timeout=self.timeout)
+        resp = self._cffi_get(
+            chapters_api,
+            headers=headers,
+            timeout=self.timeout,
+            allow_bypass=True,
+        )
 
-        raw = resp.json()
+        # orjson (when installed) decodes the chapter list straight from bytes
+        raw = parse_json(resp.content)
 
         # Primary shape: {"success": true, "data": {"chapters": [...]}}
-        chapter_list: list = []
-        try:
-            chapter_list = raw["data"]["chapters"]
-        except (KeyError, TypeError):
-            # Fallback: walk the response tree to find any list
-            chapter_list = self._find_list(raw) or []
+        chapter_list = self._follow_path(raw, self._chapter_list_path)
+        if chapter_list is None:
+            # Fallback: walk the response tree once and remember the shape
+            found = self._find_list(raw)
+            chapter_list = []
+            if found is not None:
+                self._chapter_list_path, chapter_list = found
 
         logger.info("MangaKakalot API returned %d chapters", len(chapter_list))
 
-        chapters: List[Chapter] = []
+        # Hoist attribute lookups out of the per-chapter loop
+        _number = self._extract_chapter_number
+        _vol = _RE_VOL.search
+        _extract_id = self._extract_id_from_url
+        _Chapter = Chapter
+        base = manga_page_url + "/"
+        # Every chapter URL is base + slug, so its id is the base's id plus
+        # the slug; only slugs urlparse would split need the full parse
+        id_prefix = _extract_id(base)
+        concat_ids = base.endswith("/" + id_prefix)
+        _delims = _URL_DELIMS.isdisjoint
+
+        # (sort key, chapter) pairs; the key is taken from the number string
+        # already in hand rather than via the sort_key property
+        keyed: List[Tuple[float, Chapter]] = []
+        append = keyed.append
         for ch_data in chapter_list:
             ch_slug = ch_data.get("chapter_slug", "")
             ch_name = ch_data.get("chapter_name", ch_slug)
-            chapter_url = f"{manga_page_url}/{ch_slug}"
+            chapter_url = base + ch_slug
 
-            chapter_number = self._extract_chapter_number(ch_name)
-            volume = self._extract_volume(ch_name)
+            vol_match = _vol(ch_name)
             release_date = ch_data.get("updated_at", "")
             if release_date and len(release_date) > 10:
                 release_date = release_date[:10]
 
-            chapter = Chapter(
-                chapter_id=self._extract_id_from_url(chapter_url),
+            if concat_ids and _delims(ch_slug):
+                chapter_id = id_prefix + ch_slug
+            else:
+                chapter_id = _extract_id(chapter_url)
+
+            number = _number(ch_name)
+            chapter = _Chapter(
+                chapter_id=chapter_id,
                 manga_id=manga_id,
                 title=ch_name,
-                chapter_number=chapter_number,
-                volume=volume,
+                chapter_number=number,
+                volume=vol_match.group(1) if vol_match else None,
                 url=chapter_url,
                 release_date=release_date,
                 language="en",
             )
-            chapters.append(chapter)
-
-        chapters.sort(key=lambda c: c.sort_key)
+            try:
+                key = float(number)
+            except ValueError:
+                # Non-numeric ("Extra", raw titles): defer to the model's rules
+                key = chapter.sort_key
+            append((key, chapter))
+
+        keyed.sort(key=itemgetter(0))
+        chapters = [chapter for _, chapter in keyed]
+        self._chapters_cache.set(
+            cache_key, tuple(replace(chapter) for chapter in chapters)
+        )
         logger.info(
             "Found %d MangaKakalot chapters for %s", len(chapters), manga_id
         )
@@ -464,61 +1085,165 @@ class MangakakalotProvider(BaseProvider):
             "Fetching MangaKakalot chapter images from %s", chapter_url
         )
 
-        # Derive the manga page URL for the referer
-        parsed = urlparse(chapter_url)
-        path_parts = parsed.path.strip("/").split("/")
-        # path = /manga/<slug>/<chapter-slug> → manga URL = /manga/<slug>
-        if len(path_parts) >= 2:
-            manga_referer = f"{self.base_url}/{path_parts[0]}/{path_parts[1]}"
+        html = self._fetch_html(
+            chapter_url, referer=self._chapter_referer(chapter_url)
+        )
+        images = self._extract_chapter_images(html)
+
+        logger.info(
+            "Extracted %d image URLs from chapter %s", len(images), chapter_id
+        )
+        return images
+
+    def get_chapter_images_bulk(
+        self, chapter_ids: List[str], concurrency: int = 8
+    ) -> List[List[str]]:
+        """Image URLs for many chapters, fetching the pages concurrently.
+
+        Pages are requested over one curl_cffi AsyncSession carrying the
+        solved cookies (at most *concurrency* in flight), so a whole series
+        costs roughly the slowest page rather than the sum of all of them.
+        Results keep the order of *chapter_ids*; a chapter that fails is
+        logged and returns an empty list.
+        """
+        if not chapter_ids:
+            return []
+        self._ensure_solved()
+        if _loop_running():
+            # asyncio.run() cannot nest; fetch each page on the sync path
+            pages: List[object] = [None] * len(chapter_ids)
         else:
-            manga_referer = self.base_url
-
-        soup = self._fetch_soup(chapter_url, referer=manga_referer)
-
-        # Try multiple selectors (same as reference script)
-        selectors = [
-            "div.container-chapter-reader img",
-            "div.chapter-content img",
-            "div.reader-content img",
-            "div#chapter-content img",
-            "div.pages-chapter-reader img",
-            "div.vung-doc img",
-            "div[class*='chapter'] img",
-        ]
+            pages = asyncio.run(self._afetch_chapter_pages(chapter_ids, concurrency))
 
-        images: List[str] = []
-        for sel in selectors:
-            imgs = soup.select(sel)
+        results: List[List[str]] = []
+        for chapter_id, page in zip(chapter_ids, pages):
+            if isinstance(page, str):
+                results.append(self._extract_chapter_images(page))
+                continue
+            if page is None:
+                # Challenged mid-batch: the sync path re-solves and retries
+                try:
+                    results.append(self.get_chapter_images(chapter_id))
+                    continue
+                except Exception as exc:
+                    page = exc
+            logger.error(
+                "Failed to fetch chapter images for %s: %s", chapter_id, page
+            )
+            results.append([])
+        return results
+
+    async def _afetch_chapter_pages(
+        self, chapter_ids: List[str], concurrency: int
+    ) -> list:
+        """HTML per chapter, None when Cloudflare challenged, or the exception."""
+        semaphore = asyncio.Semaphore(concurrency)
+        async with cffi_requests.AsyncSession(
+            impersonate="chrome124",
+            max_clients=concurrency,
+            cookies=self._cffi_session.cookies,
+        ) as session:
+
+            async def fetch(chapter_id: str) -> Optional[str]:
+                chapter_url = self._ensure_absolute_url(chapter_id)
+                headers = self._make_headers(self._chapter_referer(chapter_url))
+                async with semaphore:
+                    resp = await session.get(
+                        chapter_url, headers=headers, timeout=self.timeout
+                    )
+                if self._is_challenge(resp):
+                    return None
+                resp.raise_for_status()
+                return resp.text
+
+            return await asyncio.gather(
+                *(fetch(cid) for cid in chapter_ids), return_exceptions=True
+            )
+
+    def _chapter_referer(self, chapter_url: str) -> str:
+        """Manga page URL used as referer for a chapter page."""
+        # https://host/manga/<slug>/<chapter-slug> → /manga/<slug>
+        parts = chapter_url.split("/", 5)
+        if len(parts) >= 5 and parts[4]:
+            return f"{self.base_url}/{parts[3]}/{parts[4]}"
+        return self.base_url
+
+    def _extract_chapter_images(self, html: str) -> List[str]:
+        """Reader image URLs from a chapter page's HTML."""
+        if SELECTOLAX_AVAILABLE:
+            # Lexbor parses and runs the CSS selectors in C, ahead of lxml
+            # plus XPath on the most frequent call of a bulk download
+            tree = LexborHTMLParser(html)
+            images = self._select_reader_images_lexbor(tree)
+            if not images:
+                images = self._scan_cdn_images(
+                    node.attributes for node in tree.css("img")
+                )
+            return images
+
+        tree = parse_tree(html)
+        if tree is None:
+            return []
+        images = self._select_reader_images(tree)
+        if not images:
+            images = self._scan_cdn_images(_XP_IMG(tree))
+        return images
+
+    @staticmethod
+    def _select_reader_images(tree: lxml_html.HtmlElement) -> List[str]:
+        """Image URLs from the first reader layout selector that matches."""
+        candidates = _XP_ANY_CHAPTER_IMAGE(tree)
+        if not candidates:
+            return []
+        # Keep the reference script's priority: the first layout with any
+        # hit wins. Matching the few candidates is far cheaper than
+        # re-walking the whole tree per selector.
+        for sel, in_layout in _XP_CHAPTER_IMAGES:
+            imgs = [img for img in candidates if in_layout(img)]
             if imgs:
                 logger.debug("Selector '%s' → %d images", sel, len(imgs))
-                images = [
-                    img.get("src")
-                    or img.get("data-src")
-                    or img.get("data-lazy-src")
+                return [
+                    url
                     for img in imgs
+                    if (
+                        url := img.get("src")
+                        or img.get("data-src")
+                        or img.get("data-lazy-src")
+                    )
+                    and url.startswith("http")
                 ]
-                images = [
-                    url for url in images if url and url.startswith("http")
-                ]
-                break
+        return []
 
-        # Fallback: scan all <img> tags for CDN-like URLs
-        if not images:
-            all_imgs = soup.find_all("img")
-            images = [
-                img.get("src") or img.get("data-src") or ""
-                for img in all_imgs
-                if any(
-                    kw in (img.get("src") or img.get("data-src") or "")
-                    for kw in ["cdn", "storage", "img", "/chapter"]
-                )
-            ]
-            images = [u for u in images if u.startswith("http")]
-            logger.debug("Fallback img scan → %d images", len(images))
+    @staticmethod
+    def _select_reader_images_lexbor(tree: "LexborHTMLParser") -> List[str]:
+        """selectolax counterpart of _select_reader_images."""
+        for sel in _CHAPTER_IMAGE_CSS:
+            nodes = tree.css(sel)
+            if nodes:
+                logger.debug("Selector '%s' → %d images", sel, len(nodes))
+                return [
+                    url
+                    for node in nodes
+                    if (
+                        url := (attrs := node.attributes).get("src")
+                        or attrs.get("data-src")
+                        or attrs.get("data-lazy-src")
+                    )
+                    and url.startswith("http")
+                ]
+        return []
 
-        logger.info(
-            "Extracted %d image URLs from chapter %s", len(images), chapter_id
-        )
+    @staticmethod
+    def _scan_cdn_images(imgs: Iterable) -> List[str]:
+        """Fallback: keep CDN-looking URLs from any <img> (tags or attr dicts)."""
+        images = []
+        for img in imgs:
+            url = img.get("src") or img.get("data-src") or ""
+            if url.startswith("http") and any(
+                kw in url for kw in ("cdn", "storage", "img", "/chapter")
+            ):
+                images.append(url)
+        logger.debug("Fallback img scan → %d images", len(images))
         return images
 
     # ══════════════════════════════════════════════════════════════════════
@@ -534,32 +1259,148 @@ class MangakakalotProvider(BaseProvider):
         self._ensure_solved()
         assert self._cffi_session is not None
 
-        headers = {
-            "Referer": "https://www.mangakakalot.gg/",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "Sec-Fetch-Dest": "image",
-            "Sec-Fetch-Mode": "no-cors",
-            "Sec-Fetch-Site": "cross-site",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        }
         try:
             logger.debug("Downloading MangaKakalot image: %s", url)
-            resp = self._cffi_session.get(url, headers=headers, timeout=30)
+            resp = self._cffi_session.get(
+                url, headers=_IMAGE_HEADERS, timeout=30
+            )
             resp.raise_for_status()
             return resp.content
         except Exception as e:
             logger.error("Failed to download image %s: %s", url, e)
             raise ProviderError(f"Failed to download image: {e}") from e
 
+    def download_image_to(self, url: str, path: str) -> None:
+        """Stream a single CDN image straight to *path*.
+
+        Used by the Downloader instead of download_image, so a page is
+        never held in memory as a whole; chunks go to disk as curl
+        delivers them.
+        """
+        self._ensure_solved()
+        assert self._cffi_session is not None
+
+        try:
+            logger.debug("Streaming MangaKakalot image: %s -> %s", url, path)
+            resp = self._cffi_session.get(
+                url, headers=_IMAGE_HEADERS, timeout=30, stream=True
+            )
+            try:
+                resp.raise_for_status()
+                with open(path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+            finally:
+                resp.close()
+        except Exception as e:
+            logger.error("Failed to download image %s: %s", url, e)
+            raise ProviderError(f"Failed to download image: {e}") from e
+
+    def download_images(
+        self, urls: List[str], max_clients: int = 16
+    ) -> List[Optional[bytes]]:
+        """Download a batch of images concurrently on one event loop.
+
+        Useful for callers outside the threaded Downloader (e.g. grabbing a
+        whole chapter in one call). Results keep the order of *urls*;
+        failed downloads are logged and returned as ``None``.
+        """
+        if not urls:
+            return []
+        self._ensure_solved()
+        assert self._cffi_session is not None
+        if _loop_running():
+            return [self._download_or_none(url) for url in urls]
+        return asyncio.run(self._adownload_images(urls, max_clients))
+
+    def _download_or_none(self, url: str) -> Optional[bytes]:
+        try:
+            return self.download_image(url)
+        except ProviderError as exc:
+            logger.error("Failed to download image %s: %s", url, exc)
+            return None
+
+    async def _adownload_images(
+        self, urls: List[str], max_clients: int
+    ) -> List[Optional[bytes]]:
+        async with cffi_requests.AsyncSession(
+            impersonate="chrome124",
+            max_clients=max_clients,
+            cookies=self._cffi_session.cookies,
+        ) as session:
+
+            async def fetch(url: str) -> bytes:
+                resp = await session.get(
+                    url, headers=_IMAGE_HEADERS, timeout=30
+                )
+                resp.raise_for_status()
+                return resp.content
+
+            results = await asyncio.gather(
+                *(fetch(url) for url in urls), return_exceptions=True
+            )
+
+        images: List[Optional[bytes]] = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.error("Failed to download image %s: %s", url, result)
+                images.append(None)
+            else:
+                images.append(result)
+        return images
+
+    # ══════════════════════════════════════════════════════════════════════
+    #  Public API — batch lookups
+    # ══════════════════════════════════════════════════════════════════════
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="mangakakalot"
+                )
+            return self._pool
+
+    def search_many(
+        self, queries: Iterable[str], page: int = 1
+    ) -> List[Tuple[List[MangaSearchResult], bool]]:
+        """Run several searches concurrently; results keep the query order.
+
+        Requests overlap on the network and lxml releases the GIL while
+        parsing, so this scales close to linearly with the worker count.
+        """
+        return list(self._get_pool().map(lambda q: self.search(q, page), queries))
+
+    def get_manga_info_many(self, urls: Iterable[str]) -> List[MangaInfo]:
+        """Fetch manga info for several URLs concurrently, in input order."""
+        return list(self._get_pool().map(lambda u: self.get_manga_info(url=u), urls))
+
+    def close(self) -> None:
+        """Release the curl sessions (and their pooled connections) and workers."""
+        for session in (self._cffi_session, self._bare_session):
+            if session is not None:
+                session.close()
+        self._cffi_session = None
+        self._bare_session = None
+        self._solved = False
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def clear_cache(self) -> None:
+        """Drop cached manga info, chapter lists, searches and pages (e.g. on user refresh)."""
+        self._info_cache.clear()
+        self._chapters_cache.clear()
+        self._search_cache.clear()
+        self._html_cache.clear()
+
+    def invalidate_url(self, url: str) -> None:
+        """Forget the cached HTML for one page so the next fetch hits the site."""
+        url = self._ensure_absolute_url(url)
+        self._html_cache.pop(url)
+        self._search_cache.pop(url)
+
     # ══════════════════════════════════════════════════════════════════════
     #  Private helpers
     # ══════════════════════════════════════════════════════════════════════
@@ -567,16 +1408,10 @@ class MangakakalotProvider(BaseProvider):
     def _ensure_absolute_url(self, url_or_path: Optional[str]) -> str:
         if not url_or_path:
             return self.base_url
-        if url_or_path.startswith("http://") or url_or_path.startswith(
-            "https://"
-        ):
-            return url_or_path
-        return urljoin(f"{self.base_url}/", url_or_path.lstrip("/"))
+        return _absolute_url(self._base_prefix, url_or_path)
 
     def _extract_id_from_url(self, url: str) -> str:
-        parsed = urlparse(url)
-        path = parsed.path.lstrip("/")
-        return path or parsed.netloc
+        return _id_from_url(url)
 
     def _extract_slug(self, manga_id: str) -> str:
         """Extract the manga slug from a manga_id (which may be a URL or path).
@@ -600,141 +1435,109 @@ class MangakakalotProvider(BaseProvider):
         return parts[-1]
 
     @staticmethod
-    def _find_list(obj: object) -> Optional[list]:
-        """Walk a nested dict/list to find the first non-empty list."""
-        if isinstance(obj, list) and obj:
-            return obj
-        if isinstance(obj, dict):
-            for v in obj.values():
-                result = MangakakalotProvider._find_list(v)
-                if result is not None:
-                    return result
+    def _follow_path(obj: object, path: Tuple[str, ...]):
+        """Return obj[k1][k2]... for *path*, or None if it does not resolve."""
+        try:
+            for key in path:
+                obj = obj[key]
+        except (KeyError, TypeError):
+            return None
+        return obj
+
+    @staticmethod
+    def _find_list(obj: object) -> Optional[Tuple[Tuple[str, ...], list]]:
+        """Breadth-first search of nested dicts for the shallowest non-empty list.
+
+        Returns ``(key_path, list)`` so callers can go straight to the list
+        on later responses with the same shape.
+        """
+        queue = deque([((), obj)])
+        while queue:
+            path, node = queue.popleft()
+            if isinstance(node, list) and node:
+                return path, node
+            if isinstance(node, dict):
+                queue.extend((path + (k,), v) for k, v in node.items())
         return None
 
-    def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
-        selectors = [
-            "ul.manga-info-text h1",
-            ".manga-info-content h1",
-            ".story-info-right h1",
-            ".story-info-right h1.title",
-        ]
-        for sel in selectors:
-            el = soup.select_one(sel)
-            if el:
-                return el.get_text(strip=True)
-        el = soup.find("h1")
-        return el.get_text(strip=True) if el else None
-
-    def _extract_cover_url(self, soup: BeautifulSoup) -> str:
-        selectors = [
-            "div.manga-info-pic img",
-            ".manga-info-pic img",
-            ".story-info-left img",
-            ".manga-info-img img",
-        ]
-        for sel in selectors:
-            cover = soup.select_one(sel)
-            if cover:
-                return cover.get("data-src") or cover.get("src") or ""
+    def _extract_title(self, tree: lxml_html.HtmlElement) -> Optional[str]:
+        el = _first(_XP_TITLE, tree)
+        return node_text(el) if el is not None else None
+
+    def _extract_cover_url(self, tree: lxml_html.HtmlElement) -> str:
+        cover = _first(_XP_COVER, tree)
+        if cover is not None:
+            return cover.get("data-src") or cover.get("src") or ""
         return ""
 
     def _extract_alternative_titles(
-        self, soup: BeautifulSoup, main_title: str
+        self, details: _DetailIndex, main_title: str
     ) -> List[str]:
-        detail_text = self._extract_detail_text(
-            soup, ["Alternative", "Other name", "Alternative name"]
-        )
-        alternatives: List[str] = []
-        if detail_text:
-            for raw in re.split(r"[;,/]|\s{2,}", detail_text):
-                alt = raw.strip()
-                if alt and alt.lower() != main_title.lower():
-                    alternatives.append(alt)
-        return alternatives
-
-    def _extract_description(self, soup: BeautifulSoup) -> str:
-        container = soup.select_one(
-            "#panel-story-info-description .panel-body, "
-            "#panel-story-info-description, "
-            ".panel-story-info-description, "
-            ".story-info-right .description"
-        )
-        if container:
+        detail_text = self._extract_detail_text(details, _LABELS_ALT_TITLES)
+        lower_title = main_title.lower()
+        return [
+            alt
+            for alt in _split_values(detail_text)
+            if alt.lower() != lower_title
+        ]
+
+    def _extract_description(self, tree: lxml_html.HtmlElement) -> str:
+        containers = _XP_DESCRIPTION(tree)
+        if containers:
+            container = containers[0]
             paragraphs = [
-                p.get_text(" ", strip=True)
-                for p in container.select("p")
-                if p.get_text(strip=True)
+                node_text(p, " ")
+                for p in container.iterdescendants("p")
+                if node_text(p)
             ]
             if paragraphs:
                 return "\n\n".join(paragraphs)
-            return container.get_text(" ", strip=True)
+            return node_text(container, " ")
         return ""
 
     def _extract_person_list(
-        self, soup: BeautifulSoup, labels: List[str]
+        self, details: _DetailIndex, labels: Tuple[str, ...]
     ) -> List[str]:
-        detail_element = self._extract_detail_element(soup, labels)
-        if not detail_element:
+        detail_element = self._extract_detail_element(details, labels)
+        if detail_element is None:
             return []
 
         values = [
-            a.get_text(strip=True)
-            for a in detail_element.find_all("a")
-            if a.get_text(strip=True)
+            node_text(a)
+            for a in detail_element.iterdescendants("a")
+            if node_text(a)
         ]
         if values:
             return values
 
-        text = detail_element.get_text(" ", strip=True)
-        for label in labels:
-            if text.lower().startswith(label.lower()):
-                parts = text.split(":", 1)
-                if len(parts) == 2:
-                    text = parts[1].strip()
-                break
-
-        return [
-            v.strip()
-            for v in re.split(r"[;,/]|\s{2,}", text)
-            if v.strip()
-        ]
+        text = node_text(detail_element, " ")
+        value = _strip_label(text, labels)
+        return _split_values(text if value is None else value)
 
-    def _extract_genres(self, soup: BeautifulSoup) -> List[str]:
-        detail_element = self._extract_detail_element(
-            soup, ["Genre", "Genres"]
-        )
-        if detail_element:
+    def _extract_genres(self, details: _DetailIndex) -> List[str]:
+        detail_element = self._extract_detail_element(details, _LABELS_GENRE)
+        if detail_element is not None:
             genres = [
-                a.get_text(strip=True)
-                for a in detail_element.find_all("a")
-                if a.get_text(strip=True)
+                node_text(a)
+                for a in detail_element.iterdescendants("a")
+                if node_text(a)
             ]
             if genres:
                 return genres
-            text = detail_element.get_text(" ", strip=True)
+            text = node_text(detail_element, " ")
             if ":" in text:
                 text = text.split(":", 1)[1]
             return [g.strip() for g in text.split(",") if g.strip()]
         return []
 
-    def _extract_status(self, soup: BeautifulSoup) -> str:
-        status_text = self._extract_detail_text(soup, ["Status"])
-        if status_text:
-            lower = status_text.lower()
-            if "ongoing" in lower:
-                return "Ongoing"
-            if "completed" in lower:
-                return "Completed"
-            if "hiatus" in lower:
-                return "Hiatus"
-        return "Unknown"
-
-    def _extract_year(self, soup: BeautifulSoup) -> Optional[int]:
-        release_text = self._extract_detail_text(
-            soup, ["Released", "Release", "Year"]
-        )
+    def _extract_status(self, details: _DetailIndex) -> str:
+        status_text = self._extract_detail_text(details, _LABELS_STATUS)
+        return _match_status(status_text) or "Unknown"
+
+    def _extract_year(self, details: _DetailIndex) -> Optional[int]:
+        release_text = self._extract_detail_text(details, _LABELS_YEAR)
         if release_text:
-            match = re.search(r"(19|20)\d{2}", release_text)
+            match = _RE_YEAR.search(release_text)
             if match:
                 try:
                     return int(match.group(0))
@@ -743,94 +1546,51 @@ class MangakakalotProvider(BaseProvider):
         return None
 
     def _extract_detail_text(
-        self, soup: BeautifulSoup, labels: List[str]
+        self, details: _DetailIndex, labels: Tuple[str, ...]
     ) -> str:
-        el = self._extract_detail_element(soup, labels)
-        if not el:
+        el = self._extract_detail_element(details, labels)
+        if el is None:
             return ""
-        text = el.get_text(" ", strip=True)
-        for label in labels:
-            if text.lower().startswith(label.lower()):
-                parts = text.split(":", 1)
-                if len(parts) == 2:
-                    return parts[1].strip()
-        return text.strip()
+        text = node_text(el, " ")
+        value = _strip_label(text, labels)
+        return text.strip() if value is None else value
 
     def _extract_detail_element(
-        self, soup: BeautifulSoup, labels: List[str]
+        self, details: _DetailIndex, labels: Tuple[str, ...]
     ):
-        # Try new-style layout first
-        info_section = soup.select_one(".story-info-right")
-        if info_section:
-            title_elements = info_section.select(".story-info-right-title")
-            detail_elements = info_section.select(".story-info-right-detail")
-            if len(title_elements) == len(detail_elements):
-                for title_el, detail_el in zip(title_elements, detail_elements):
-                    label_text = (
-                        title_el.get_text(" ", strip=True).rstrip(":").lower()
-                    )
-                    for label in labels:
-                        if label.lower() in label_text:
-                            return detail_el
-
-        # Fallback: old-style layout
-        fallback = soup.select_one(
-            ".manga-info-text, .manga-info-content, ul.manga-info-text"
-        )
-        if fallback:
-            for element in fallback.find_all(
-                ["li", "p", "span", "div"], recursive=True
-            ):
-                text = element.get_text(" ", strip=True)
-                if not text:
-                    continue
-                lower_text = text.lower()
-                for label in labels:
-                    ll = label.lower()
-                    if lower_text.startswith(ll) or f"{ll}:" in lower_text:
-                        return element
-        return None
+        # New-style layout first, then the old-style fallback
+        return details.find(labels)
 
     def _extract_chapter_number(self, chapter_title: str) -> str:
-        match = re.search(
-            r"(?:chapter|ch\.?|cap\.)\s*(\d+(?:\.\d+)?)",
-            chapter_title,
-            re.IGNORECASE,
-        )
-        if match:
-            return match.group(1)
-        match = re.search(r"(\d+(?:\.\d+)?)", chapter_title)
+        # Fast path for the dominant "Chapter N..." form: plain string ops,
+        # returning exactly what the pattern below would capture
+        if chapter_title.startswith(("Chapter ", "chapter ", "CHAPTER ")):
+            rest = chapter_title[8:].lstrip()
+            end, size = 0, len(rest)
+            while end < size and rest[end].isdecimal():
+                end += 1
+            if end:
+                if end + 1 < size and rest[end] == "." and rest[end + 1].isdecimal():
+                    end += 2
+                    while end < size and rest[end].isdecimal():
+                        end += 1
+                return rest[:end]
+
+        match = _RE_CHAPTER_OR_NUM.match(chapter_title)
         if match:
-            return match.group(1)
+            return match.group(1) or match.group(2)
         return chapter_title.strip()
 
-    def _extract_volume(self, chapter_title: str) -> Optional[str]:
-        match = re.search(
-            r"vol(?:ume)?\.?\s*(\d+)", chapter_title, re.IGNORECASE
-        )
-        return match.group(1) if match else None
-
     def _has_next_page(
-        self, soup: BeautifulSoup, current_page: int = 1
+        self, tree: lxml_html.HtmlElement, current_page: int = 1
     ) -> bool:
-        pagination_selectors = [
-            ".pagination .next",
-            ".pagination a[href*='page']",
-            "a[href*='?page=']",
-            ".page-nav .next",
-            ".pager .next",
-        ]
-        for selector in pagination_selectors:
-            if soup.select_one(selector):
-                return True
+        if _XP_NEXT_PAGE(tree):
+            return True
 
-        page_links = soup.select(
-            ".pagination a, .page-nav a, a[href*='page=']"
-        )
-        for link in page_links:
+        for link in _XP_PAGE_LINKS(tree):
             href = link.get("href", "")
             if "?page=" in href or "/page/" in href:
-                page_match = re.search(r"[?&]page=(\d+)", href)
+                page_match = _RE_PAGE.search(href)
                 if page_match:
                     try:
                         page_num = int(page_match.group(1))
@@ -839,13 +1599,11 @@ class MangakakalotProvider(BaseProvider):
                     except ValueError:
                         continue
 
-        for anchor in soup.select("a"):
-            text = anchor.get_text(strip=True).lower()
-            if text in {"next", ">", ">>", "more", "next page"}:
+        for anchor in _XP_ANCHORS(tree):
+            if node_text(anchor).lower() in _NEXT_PAGE_TEXTS:
                 return True
 
-        result_items = soup.select("div.story_item")
-        return len(result_items) > 0
+        return bool(_XP_STORIES(tree))
 
     # Override get_headers so base class doesn't break on import
     def get_headers(self) -> dict:
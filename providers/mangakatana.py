@@ -1,19 +1,94 @@
 import re
+import time
 from typing import List, Optional
 from urllib.parse import quote
 
 from bs4 import BeautifulSoup
 import httpx
+from lxml import etree
 
 from core.base_provider import BaseProvider, ProviderError
+from core.utils import create_http_client, has_class, node_text, parse_tree, TTLCache
 from models import MangaSearchResult, MangaInfo, Chapter
 
 
+_CHAPTER_NUM_RE = re.compile(r"Chapter\s+([\d.]+)", re.IGNORECASE)
+# Reader pages embed the image list as a JS array literal of quoted URLs.
+# [^\]]* stops at the array's first "]" instead of a lazy DOTALL scan that
+# re-tests for "];" at every character of the page
+_JS_ARRAY_RE = re.compile(r"var\s+\w+\s*=\s*\[([^\]]*)\];")
+_URL_RE = re.compile(r"'(https://[^']+)'")
+
+
+# Search results and chapter rows are read with lxml directly: the per-row
+# lookups run as precompiled XPath in libxml2 instead of soupsieve walks.
+# Each (...)[1] matches what select_one would return for the CSS selector
+_XP_BOOK_LIST = etree.XPath("(//*[@id='book_list'])[1]")
+_XP_ITEMS = etree.XPath(f".//div[{has_class('item')}]")
+_XP_ITEM_TITLE = etree.XPath(f"(.//a[ancestor::h3[{has_class('title')}]])[1]")
+_XP_ITEM_COVER = etree.XPath(f"(.//img[ancestor::*[{has_class('wrap_img')}]])[1]")
+_XP_NEXT_PAGE = etree.XPath(
+    f"boolean(//a[{has_class('next')} and {has_class('page-numbers')}])"
+)
+_XP_CHAPTER_ROWS = etree.XPath(f"//table[{has_class('uk-table')}]//tbody//tr")
+_XP_CHAPTER_LINK = etree.XPath(f"(.//a[ancestor::div[{has_class('chapter')}]])[1]")
+_XP_UPDATE_TIME = etree.XPath(f"(.//div[{has_class('update_time')}])[1]")
+
+
 class MangaKatanaProvider(BaseProvider):
     provider_id = "mangakatana"
     provider_name = "MangaKatana"
     base_url = "https://mangakatana.com"
 
+    # Manga pages hold the chapter list too, so a copy is only trusted this
+    # long (seconds) before it is revalidated
+    manga_page_ttl = 15 * 60
+
+    def __init__(self):
+        super().__init__()
+        # Pooled (HTTP/2 when available) client: pages and the downloader's
+        # image workers reuse its keep-alive connections instead of
+        # handshaking again, with transport retries on connect errors
+        self.session.close()
+        self.session = create_http_client(headers=self.get_headers(), retries=2)
+        # Manga page URL -> (fetched at, final URL, HTML, ETag). Entries outlive
+        # manga_page_ttl so a stale page can still be revalidated by ETag
+        self._page_cache = TTLCache(maxsize=64, ttl=24 * 60 * 60)
+
+    def close(self) -> None:
+        """Release the pooled connections."""
+        self.session.close()
+
+    def clear_cache(self) -> None:
+        """Drop cached manga pages (e.g. when the user asks for a refresh)."""
+        self._page_cache.clear()
+
+    def _get_manga_page(self, url: str) -> tuple[str, str]:
+        """Return (final URL, HTML) of a manga page, shared by info and chapters.
+
+        A copy younger than manga_page_ttl is reused outright, so showing a
+        manga and then listing its chapters costs one request. An older copy
+        is revalidated with If-None-Match and reused on 304 Not Modified.
+        """
+        cached = self._page_cache.get(url)
+        headers = {}
+        if cached is not None:
+            fetched_at, final_url, text, etag = cached
+            if time.monotonic() - fetched_at < self.manga_page_ttl:
+                return final_url, text
+            if etag:
+                headers["If-None-Match"] = etag
+
+        resp = self.session.get(url, headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            _, final_url, text, etag = cached
+        else:
+            resp.raise_for_status()
+            final_url, text = str(resp.url), resp.text
+            etag = resp.headers.get("ETag", "")
+        self._page_cache.set(url, (time.monotonic(), final_url, text, etag))
+        return final_url, text
+
     def get_headers(self) -> dict:
         headers = super().get_headers()
         headers.update({
@@ -27,32 +102,39 @@ class MangaKatanaProvider(BaseProvider):
         })
         return headers
 
+    def _parse_html(self, html: str) -> BeautifulSoup:
+        # lxml's C parser is far faster than html.parser on full pages
+        return BeautifulSoup(html, "lxml")
+
     def search(self, query: str, page: int = 1) -> tuple[List[MangaSearchResult], bool]:
         encoded_query = quote(query)
         url = f"{self.base_url}/page/{page}?search={encoded_query}&search_by=m_name"
         
         resp = self.session.get(url)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        tree = parse_tree(resp.text)
+        if tree is None:
+            return [], False
 
-        book_list = soup.select_one("#book_list")
+        book_list = _XP_BOOK_LIST(tree)
         if not book_list:
             return [], False
 
-        items = book_list.select("div.item")
         results = []
 
-        for item in items:
-            title_tag = item.select_one("h3.title a")
-            if not title_tag:
+        for item in _XP_ITEMS(book_list[0]):
+            title_tags = _XP_ITEM_TITLE(item)
+            if not title_tags:
                 continue
+            title_tag = title_tags[0]
 
-            title = title_tag.get_text(strip=True)
-            href = str(title_tag.get("href", ""))
-            
-            cover_tag = item.select_one(".wrap_img img")
+            title = node_text(title_tag)
+            href = title_tag.get("href", "")
+
+            cover_tags = _XP_ITEM_COVER(item)
             cover = ""
-            if cover_tag:
+            if cover_tags:
+                cover_tag = cover_tags[0]
                 cover_val = (
                     cover_tag.get("data-src")
                     or cover_tag.get("data-lazy-src")
@@ -71,7 +153,7 @@ class MangaKatanaProvider(BaseProvider):
                 url=href if href.startswith("http") else f"{self.base_url}/{href.lstrip('/')}"
             ))
 
-        has_next = bool(soup.select_one("a.next.page-numbers"))
+        has_next = _XP_NEXT_PAGE(tree)
         return results, has_next
 
     def get_manga_info(self, manga_id: Optional[str] = None, url: Optional[str] = None) -> MangaInfo:
@@ -81,9 +163,8 @@ class MangaKatanaProvider(BaseProvider):
         if not url:
             raise ValueError("Must provide url or manga_id")
 
-        resp = self.session.get(url)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        final_url, text = self._get_manga_page(url)
+        soup = self._parse_html(text)
 
         title_tag = soup.select_one("div.info h1.heading")
         title = title_tag.get_text(strip=True) if title_tag else "Unknown"
@@ -121,7 +202,7 @@ class MangaKatanaProvider(BaseProvider):
         description = desc_tag.get_text(strip=True) if desc_tag else ""
         
         # Determine actual ID from the URL we ended up at
-        actual_id = str(resp.url).split("/")[-1]
+        actual_id = final_url.split("/")[-1]
 
         return MangaInfo(
             provider_id=self.provider_id,
@@ -129,7 +210,7 @@ class MangaKatanaProvider(BaseProvider):
             title=title,
             alternative_titles=alt_titles,
             cover_url=cover_url,
-            url=str(resp.url),
+            url=final_url,
             description=description,
             authors=authors,
             artists=[],
@@ -140,39 +221,38 @@ class MangaKatanaProvider(BaseProvider):
 
     def get_chapters(self, manga_id: str) -> List[Chapter]:
         url = f"{self.base_url}/manga/{manga_id}"
-        resp = self.session.get(url)
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        _, text = self._get_manga_page(url)
+        tree = parse_tree(text)
+        if tree is None:
+            return []
 
         chapters = []
-        for row in soup.select("table.uk-table tbody tr"):
-            ch_tag = row.select_one("div.chapter a")
-            date_tag = row.select_one("div.update_time")
-            if not ch_tag:
+        for row in _XP_CHAPTER_ROWS(tree):
+            ch_tags = _XP_CHAPTER_LINK(row)
+            if not ch_tags:
                 continue
+            ch_tag = ch_tags[0]
+            date_tags = _XP_UPDATE_TIME(row)
+            date_tag = date_tags[0] if date_tags else None
 
-            ch_title = ch_tag.get_text(strip=True)
-            ch_url = str(ch_tag.get("href", ""))
+            ch_title = node_text(ch_tag)
+            ch_url = ch_tag.get("href", "")
             
             # Extract chapter number, fallback to raw title if unable
-            m = re.search(r'Chapter\s+([\d\.]+)', ch_title, re.IGNORECASE)
+            m = _CHAPTER_NUM_RE.search(ch_title)
             ch_num = m.group(1) if m else ch_title
-            
-            # If the title is just "Chapter X", make the title empty so it isn't redundant
-            # Because the CLI renders: f"Chapter {chapter.number} - {chapter.title}"
+
+            # Drop a leading "Chapter X" so the title isn't redundant, because
+            # the CLI renders: f"Chapter {chapter.number} - {chapter.title}".
+            # "Chapter 1: The Beginning" becomes "The Beginning" and a bare
+            # "Chapter X" becomes "". ch_title is already stripped, so the
+            # match position says it all: no lower()/strip()/startswith copies
             clean_title = ch_title
-            if m and ch_title.strip().lower() == f"chapter {ch_num}".lower():
-                clean_title = ""
-            elif m:
-                # If it's something like "Chapter 1: The Beginning", extract "The Beginning"
-                # or just leave it as is if extracting is messy.
-                # Let's remove the "Chapter X" prefix from the title if it starts with it
-                prefix = m.group(0)
-                if ch_title.startswith(prefix):
-                    clean_title = ch_title[len(prefix):].lstrip(" -:")
+            if m and m.start() == 0:
+                clean_title = ch_title[m.end():].lstrip(" -:")
             
             ch_id = ch_url
-            date_str = date_tag.get_text(strip=True) if date_tag else None
+            date_str = node_text(date_tag) if date_tag is not None else None
 
             chapters.append(Chapter(
                 chapter_id=ch_id,
@@ -210,15 +290,14 @@ class MangaKatanaProvider(BaseProvider):
         html = resp.text
 
         # ── Primary: extract from JS array ──────────────────────────────────────
-        arrays = re.findall(r"var\s+(\w+)\s*=\s*\[(.*?)\];", html, re.DOTALL)
-        for name, content in arrays:
-            urls = re.findall(r"'(https://[^']+)'", content)
+        for content in _JS_ARRAY_RE.findall(html):
+            urls = _URL_RE.findall(content)
             if len(urls) > 5:
                 # Need to return these correctly encoded or without single quotes
                 return urls
 
         # ── Fallback: scrape <img data-src> / <img src> from HTML ───────────────
-        soup = BeautifulSoup(html, "html.parser")
+        soup = self._parse_html(html)
         images = []
         for img_div in soup.select("div.wrap_img"):
             img_tag = img_div.select_one("img")
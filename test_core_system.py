@@ -264,6 +264,38 @@ def test_converter():
         return False
 
 
+def test_mangabuddy_scraper_profile():
+    """Test that the MangaBuddy scraper keeps its Chrome/Windows browser profile."""
+    logger.info("Testing MangaBuddy scraper profile...")
+
+    try:
+        import cloudscraper  # noqa: F401
+    except ImportError:
+        logger.info("cloudscraper not installed, skipping")
+        return True
+
+    from providers import mangabuddy
+    import tempfile
+
+    # Keep the requests-cache database out of the working directory
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original_cache_path = mangabuddy.CACHE_PATH
+        mangabuddy.CACHE_PATH = Path(temp_dir) / 'mangabuddy'
+        try:
+            scraper = mangabuddy.create_scraper()
+            user_agent = scraper.headers.get('User-Agent', '')
+            scraper.close()
+        finally:
+            mangabuddy.CACHE_PATH = original_cache_path
+
+    # A dropped browser argument gives a random (often Firefox/Mac) profile
+    assert 'Chrome' in user_agent and 'Firefox' not in user_agent, user_agent
+    assert 'Windows' in user_agent, user_agent
+
+    logger.info(f"✓ Scraper profile User-Agent: {user_agent}")
+    return True
+
+
 def main():
     """Run all tests."""
     logger.info("Starting MangaForge Phase 1 core system tests...")
@@ -274,6 +306,7 @@ def main():
         ("Configuration System", test_config_system),
         ("Downloader", test_downloader),
         ("Converter", test_converter),
+        ("MangaBuddy Scraper Profile", test_mangabuddy_scraper_profile),
     ]
 
     results = []